@@ -1,20 +1,27 @@
 #!/usr/bin/env python3
 
+import asyncio
 import runpod
 import time
 import traceback
 import uuid
-from pathlib import Path
 from typing import Dict, Any
 
 # Import our modular components
 from src.config import config
 from src.comfyui_manager import comfyui_manager
 from src.s3_handler import s3_handler
-from src.workflow_processor import workflow_processor
+from src.workflow_processor import randomize_seeds
 
 
-def handler(event: Dict[str, Any]) -> Dict[str, Any]:
+def _as_result(outcome: Any, key: str) -> Dict[str, Any]:
+    """Turn an exception returned by gather() into a failed storage result."""
+    if isinstance(outcome, BaseException):
+        return {"success": False, key: None, "error": str(outcome)}
+    return outcome
+
+
+async def handler(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     RunPod handler for ComfyUI workflows.
 
@@ -34,7 +41,7 @@ def handler(event: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         # Start ComfyUI server if needed
-        if not comfyui_manager.start_server_if_needed():
+        if not await asyncio.to_thread(comfyui_manager.start_server_if_needed):
             return {"error": "ComfyUI could not be started"}
 
         # Extract and validate workflow
@@ -42,20 +49,23 @@ def handler(event: Dict[str, Any]) -> Dict[str, Any]:
         if not workflow:
             return {"error": "No 'workflow' found in input"}
 
-        # Randomize seeds if enabled
-        workflow = workflow_processor.randomize_seeds(workflow)
+        # Randomize seeds if enabled (the workflow was parsed for this request, so
+        # it can be modified in place)
+        workflow = randomize_seeds(workflow, in_place=True)
 
         # Execute workflow
-        result = comfyui_manager.run_workflow(workflow)
+        result = await asyncio.to_thread(comfyui_manager.run_workflow, workflow)
         if not result:
             return {"error": "Workflow could not be executed"}
 
         # Find generated images
         workflow_start_time = result.get(
             "_workflow_start_time",
-            time.time() - config.get_workflow_config()["default_workflow_duration"],
+            time.time() - config.DEFAULT_WORKFLOW_DURATION,
+        )
+        image_paths = await asyncio.to_thread(
+            comfyui_manager.find_generated_images, result, workflow_start_time
         )
-        image_paths = comfyui_manager.find_generated_images(result, workflow_start_time)
 
         if not image_paths:
             return {"error": "No generated images found"}
@@ -69,15 +79,32 @@ def handler(event: Dict[str, Any]) -> Dict[str, Any]:
         failed_uploads = []
         s3_success_count = 0
 
-        for img_path in image_paths:
-            # Always save to volume as backup
-            volume_result = s3_handler.copy_to_volume(img_path)
+        # Always save to volume as backup; upload to S3 if configured.
+        # Copies and uploads for all images run concurrently (read-only on source)
+        # A failing copy or upload is reported per image instead of cancelling the rest
+        volume_gather = asyncio.gather(
+            *(asyncio.to_thread(s3_handler.copy_to_volume, p) for p in image_paths),
+            return_exceptions=True,
+        )
+        if config.is_s3_configured():
+            s3_gather = asyncio.gather(
+                *(s3_handler.upload_file_async(p, job_id) for p in image_paths),
+                return_exceptions=True,
+            )
+            volume_results, s3_results = await asyncio.gather(volume_gather, s3_gather)
+            s3_results = [_as_result(r, "url") for r in s3_results]
+        else:
+            volume_results = await volume_gather
+            s3_results = [None] * len(image_paths)
+        volume_results = [_as_result(r, "path") for r in volume_results]
+
+        for img_path, volume_result, s3_result in zip(
+            image_paths, volume_results, s3_results
+        ):
             if volume_result["success"]:
                 volume_paths.append(volume_result["path"])
 
-            # Upload to S3 if configured
-            if config.is_s3_configured():
-                s3_result = s3_handler.upload_file(img_path, job_id)
+            if s3_result is not None:
                 if s3_result["success"]:
                     output_urls.append(s3_result["url"])
                     s3_success_count += 1
@@ -137,7 +164,7 @@ def handler(event: Dict[str, Any]) -> Dict[str, Any]:
             print(f"⚠️ {len(failed_uploads)} image(s) failed to upload")
 
         # Cleanup temp files if enabled
-        comfyui_manager.cleanup_temp_files(image_paths)
+        await asyncio.to_thread(comfyui_manager.cleanup_temp_files, image_paths)
 
         print(f"✅ Handler successful! {len(output_urls)} images processed")
         if actual_storage_type == "s3":
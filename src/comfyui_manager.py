@@ -2,30 +2,93 @@
 ComfyUI server management for RunPod Serverless
 """
 
+import ctypes
+import heapq
+import json
 import os
+import random
+import select
 import shlex
 import shutil
+import socket
+import stat
 import subprocess
+import threading
 import time
 import traceback
 import uuid
 import sys
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # Optional: push-based completion events instead of /history polling
+    import websocket
+except ImportError:
+    websocket = None
 
 from .config import config
 
+# inotify event masks (see inotify(7)) used to wait for the network volume mount
+_IN_ATTRIB = 0x00000004
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+
+# Minimum seconds between "still waiting" progress lines in poll loops
+_PROGRESS_LOG_INTERVAL = 15.0
+
 
 class ComfyUIManager:
     """Manage ComfyUI server lifecycle and operations"""
 
     def __init__(self):
+        self._logger = None
         self._comfyui_process = None
-        self._comfyui_path = config.get_workspace_config()["comfyui_path"]
-        self._comfyui_logs_path = config.get_workspace_config()["comfyui_logs_path"]
+        # Latched after the first successful start so warm invocations skip setup
+        self._started_ok = False
+        self._gpu_probe: Optional[threading.Thread] = None
+        workspace_config = config.get_workspace_config()
+        self._comfyui_path = workspace_config["comfyui_path"]
+        self._comfyui_path_str = workspace_config["comfyui_path_str"]
+        self._comfyui_logs_path = workspace_config["comfyui_logs_path"]
+        # Config is loaded once per container, so snapshot the per-request flags
+        self._cleanup_enabled = config.get("cleanup_temp_files", True)
+        self._refresh_enabled = config.get("comfy_refresh_models", True)
+        # Reuse one keep-alive connection pool for all loopback calls to ComfyUI.
+        # Retries are disabled because every caller already has its own poll loop,
+        # and proxy/netrc env lookups are skipped since the target is local.
+        self._session = requests.Session()
+        self._session.trust_env = False
+        self._session.mount(
+            config.get_comfyui_base_url(),
+            HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=Retry(total=0)),
+        )
+
+    @property
+    def logger(self):
+        """Lazy initialization of logger to avoid circular imports"""
+        if self._logger is None:
+            from .logger import get_logger
+
+            self._logger = get_logger("comfyui_manager")
+        return self._logger
+
+    @cached_property
+    def comfy_models_dir(self) -> Path:
+        """ComfyUI models directory, resolved once per container lifetime
+
+        Changes to the workspace config after first access are not picked up,
+        which matches the load-once singleton config.
+        """
+        return config.get_workspace_config()["comfyui_models_path"]
 
     def _detect_comfyui_version(self) -> str:
         """Detect ComfyUI version from git repo or fallback markers"""
@@ -65,16 +128,80 @@ class ComfyUIManager:
         except Exception:
             return "unknown"
 
+    def _wait_until(
+        self,
+        predicate: Callable[[], bool],
+        timeout: float,
+        interval: float = 0.05,
+        backoff: float = 1.0,
+    ) -> bool:
+        """Poll predicate until it returns True or timeout is reached
+
+        The sleep between polls is multiplied by backoff after every miss and
+        never overshoots the deadline.
+        """
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval *= backoff
+        return True
+
     def _wait_for_path(
         self, path: Path, timeout: int = 20, poll_interval: float = 1.0
     ) -> bool:
-        """Wait until a path exists or timeout is reached"""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            if path.exists():
-                return True
-            time.sleep(poll_interval)
-        return path.exists()
+        """Wait until a path exists or timeout is reached
+
+        Blocks on inotify events for the parent directory when available and
+        falls back to polling every poll_interval seconds otherwise.
+        """
+        if path.exists():
+            return True
+        result = self._wait_for_path_inotify(path, timeout)
+        if result is not None:
+            return result
+        return self._wait_until(path.exists, timeout, interval=poll_interval)
+
+    def _wait_for_path_inotify(self, path: Path, timeout: float) -> Optional[bool]:
+        """Wait for path to appear using inotify on its parent directory
+
+        Returns:
+            True/False once the wait finished, or None if inotify is unavailable
+            (non-Linux, missing parent directory, or init failure)
+        """
+        if not sys.platform.startswith("linux") or not path.parent.is_dir():
+            return None
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+
+        try:
+            mask = _IN_CREATE | _IN_MOVED_TO | _IN_ATTRIB
+            if libc.inotify_add_watch(fd, os.fsencode(path.parent), mask) < 0:
+                return None
+
+            # Re-check after arming the watch so a creation in between is not missed
+            deadline = time.monotonic() + timeout
+            while not path.exists():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                ready, _, _ = select.select([fd], [], [], remaining)
+                if ready:
+                    try:
+                        # Drain the event queue; existence is re-checked above
+                        os.read(fd, 4096)
+                    except BlockingIOError:
+                        pass
+            return True
+        finally:
+            os.close(fd)
 
     def _get_volume_base(self) -> Path:
         """Determine the base mount path for the Network Volume"""
@@ -83,129 +210,123 @@ class ComfyUIManager:
 
         volume_path = volume_config["runpod_volume_path"]
         if self._wait_for_path(volume_path, timeout=timeout):
-            print(f"📦 Detected Serverless Network Volume at {volume_path}")
+            self.logger.info(f"📦 Detected Serverless Network Volume at {volume_path}")
             return volume_path
 
         workspace_path = config.get_workspace_config()["workspace_path"]
-        print(f"📦 Using {workspace_path} as volume base (no {volume_path} detected)")
+        self.logger.info(
+            f"📦 Using {workspace_path} as volume base (no {volume_path} detected)"
+        )
         return workspace_path
 
     def _setup_volume_models(self) -> bool:
         """Setup Volume Models with symlinks"""
-        print("📦 Setting up Volume Models with symlinks...")
+        self.logger.info("📦 Setting up Volume Models with symlinks...")
 
-        try:
-            volume_base = self._get_volume_base()
-            print(f"🔍 Volume Base: {volume_base}")
+        # Snapshot config lookups once for the whole setup pass
+        volume_config = config.get_volume_config()
+        workspace_path = config.get_workspace_config()["workspace_path"]
 
-            # Check the most common Volume Model structures
-            possible_volume_model_dirs = []
-            override_dir = config.get_volume_config().get("volume_models_dir")
+        try:
+            # An explicit VOLUME_MODELS_DIR that exists skips the volume probing
+            volume_base = None
+            volume_models_dir = None
+            volume_stat = None
+            override_dir = volume_config.get("volume_models_dir")
             if override_dir:
-                possible_volume_model_dirs.append(Path(override_dir))
-            possible_volume_model_dirs.extend(
-                [
+                volume_stat = self._stat_dir(override_dir)
+                if volume_stat is not None:
+                    volume_models_dir = Path(override_dir)
+                    self.logger.info(
+                        f"✅ Volume Models Directory found: {volume_models_dir}"
+                    )
+
+            if volume_models_dir is None:
+                volume_base = self._get_volume_base()
+                self.logger.info(f"🔍 Volume Base: {volume_base}")
+
+                # Check the most common Volume Model structures
+                possible_volume_model_dirs = [
                     volume_base / "ComfyUI" / "models",
                     volume_base / "models",
                     volume_base / "comfyui_models",
                 ]
-            )
-
-            volume_models_dir = None
-            for path in possible_volume_model_dirs:
-                if path.exists():
-                    print(f"✅ Volume Models Directory found: {path}")
-                    volume_models_dir = path
-                    break
-
-            if not volume_models_dir:
-                print(
-                    f"⚠️ No Volume Models found in: {[str(p) for p in possible_volume_model_dirs]}"
-                )
-                return False
+                for path in possible_volume_model_dirs:
+                    volume_stat = self._stat_dir(path)
+                    if volume_stat is not None:
+                        self.logger.info(f"✅ Volume Models Directory found: {path}")
+                        volume_models_dir = path
+                        break
+
+                if volume_models_dir is None:
+                    if override_dir:
+                        possible_volume_model_dirs.insert(0, Path(override_dir))
+                    self.logger.warning(
+                        f"⚠️ No Volume Models found in: {[str(p) for p in possible_volume_model_dirs]}"
+                    )
+                    return False
 
             # ComfyUI Models Directory
-            comfy_models_dir = config.get_workspace_config()["comfyui_models_path"]
+            comfy_models_dir = self.comfy_models_dir
             comfy_models_parent = comfy_models_dir.parent
             comfy_models_parent.mkdir(parents=True, exist_ok=True)
 
-            # Check for self-referential symlink
-            try:
-                volume_resolved = volume_models_dir.resolve()
-                comfy_resolved = (
-                    comfy_models_dir.resolve()
-                    if comfy_models_dir.exists()
-                    else comfy_models_dir
+            # Check for self-referential symlink by comparing device/inode of the
+            # probe's stat result instead of resolving both paths
+            comfy_stat = self._stat_dir(comfy_models_dir)
+            if comfy_stat is not None and os.path.samestat(volume_stat, comfy_stat):
+                self.logger.info(
+                    f"✅ Volume models directory is already at the expected location: {comfy_models_dir}"
                 )
+                self.logger.warning(
+                    f"⚠️ Skipping symlink creation (would be self-referential)"
+                )
+                return True
 
-                if volume_resolved == comfy_resolved:
-                    print(
-                        f"✅ Volume models directory is already at the expected location: {comfy_models_dir}"
-                    )
-                    print(f"⚠️ Skipping symlink creation (would be self-referential)")
-                    return True
-
-                # Also check if both are under WORKSPACE_PATH
-                if volume_base == config.get_workspace_config()["workspace_path"]:
-                    print(
-                        f"⚠️ No network volume detected (using {volume_base} as fallback)"
-                    )
-                    print(f"✅ Using local models directory: {comfy_models_dir}")
-                    comfy_models_dir.mkdir(parents=True, exist_ok=True)
-                    return True
-            except (FileNotFoundError, OSError) as e:
-                print(f"⚠️ Path resolution warning: {e}")
-
-            # Handle existing symlinks or directories
-            symlink_needed = True
+            # Also check if both are under WORKSPACE_PATH
+            if volume_base == workspace_path:
+                self.logger.warning(
+                    f"⚠️ No network volume detected (using {volume_base} as fallback)"
+                )
+                self.logger.info(f"✅ Using local models directory: {comfy_models_dir}")
+                comfy_models_dir.mkdir(parents=True, exist_ok=True)
+                return True
 
+            # Handle existing symlinks or directories. An existing symlink is
+            # not removed first: the new one is created under a temporary name
+            # and renamed over it, which is atomic and leaves no window where
+            # the path is missing or can be raced into by another process.
             if comfy_models_dir.is_symlink():
-                try:
-                    current_target = comfy_models_dir.resolve()
-                    if current_target == volume_models_dir.resolve():
-                        print("🔗 Symlink already exists and points to the volume.")
-                        symlink_needed = False
-                    else:
-                        print(
-                            f"🗑️ Removing existing symlink: {comfy_models_dir} → {current_target}"
-                        )
-                        comfy_models_dir.unlink()
-                except (FileNotFoundError, OSError):
-                    print("🗑️ Removing broken symlink")
-                    comfy_models_dir.unlink()
+                if comfy_stat is not None:
+                    # Not self-referential, so the symlink points somewhere else
+                    self.logger.info(
+                        f"🗑️ Replacing existing symlink: {comfy_models_dir} → {self._symlink_target(comfy_models_dir)}"
+                    )
+                else:
+                    self.logger.info("🗑️ Replacing broken symlink")
             elif comfy_models_dir.exists():
-                print(f"🗑️ Removing local models directory: {comfy_models_dir}")
-                shutil.rmtree(comfy_models_dir)
+                self.logger.info(
+                    f"🗑️ Removing local models directory: {comfy_models_dir}"
+                )
+                self._remove_local_models_dir(comfy_models_dir)
 
-            # Create symlink if needed
-            if symlink_needed:
-                print(f"🔗 Creating symlink: {comfy_models_dir} → {volume_models_dir}")
-                try:
-                    comfy_models_dir.symlink_to(
-                        volume_models_dir, target_is_directory=True
-                    )
-                except FileExistsError:
-                    print(f"⚠️ Symlink already exists (race condition)")
-                    if comfy_models_dir.is_symlink():
-                        try:
-                            current_target = comfy_models_dir.resolve()
-                            if current_target == volume_models_dir.resolve():
-                                print("🔗 Symlink is correct")
-                            else:
-                                print(
-                                    f"❌ Symlink points to wrong target: {current_target}"
-                                )
-                                return False
-                        except (FileNotFoundError, OSError):
-                            print("❌ Symlink is broken")
-                            return False
-                    else:
-                        print("❌ Path is blocked by file/directory")
-                        return False
+            self.logger.info(
+                f"🔗 Creating symlink: {comfy_models_dir} → {volume_models_dir}"
+            )
+            tmp_link = comfy_models_dir.with_name(
+                f"{comfy_models_dir.name}.new-{uuid.uuid4().hex[:8]}"
+            )
+            tmp_link.symlink_to(volume_models_dir, target_is_directory=True)
+            try:
+                os.replace(tmp_link, comfy_models_dir)
+            except OSError as e:
+                tmp_link.unlink()
+                self.logger.error(f"❌ Path is blocked by file/directory: {e}")
+                return False
 
             # Verify the symlink
             if comfy_models_dir.is_symlink() and comfy_models_dir.exists():
-                print(f"✅ Symlink successfully created and verified!")
+                self.logger.info(f"✅ Symlink successfully created and verified!")
 
                 # Show available model types
                 model_subdirs = [
@@ -220,50 +341,147 @@ class ComfyUIManager:
                 ]
                 found_types = []
 
-                for subdir in model_subdirs:
-                    subdir_path = comfy_models_dir / subdir
-                    if subdir_path.exists():
-                        model_files = list(subdir_path.glob("*.safetensors")) + list(
-                            subdir_path.glob("*.ckpt")
+                # One directory read tells which model types exist at all
+                known_subdirs = frozenset(model_subdirs)
+                try:
+                    with os.scandir(comfy_models_dir) as entries:
+                        present = {
+                            entry.name
+                            for entry in entries
+                            if entry.name in known_subdirs and entry.is_dir()
+                        }
+                except OSError:
+                    present = set()
+                present_subdirs = [
+                    subdir for subdir in model_subdirs if subdir in present
+                ]
+
+                # Each scan is a metadata round trip on the network volume, so
+                # run them concurrently and report in the original order
+                if present_subdirs:
+                    with ThreadPoolExecutor(
+                        max_workers=len(present_subdirs)
+                    ) as executor:
+                        model_counts = list(
+                            executor.map(
+                                lambda subdir: self._count_model_files(
+                                    comfy_models_dir / subdir
+                                ),
+                                present_subdirs,
+                            )
                         )
-                        if model_files:
-                            print(f"   📂 {subdir}: {len(model_files)} Models")
-                            found_types.append(subdir)
-                        else:
-                            print(f"   📂 {subdir}: Directory exists, but empty")
+                else:
+                    model_counts = []
+
+                for subdir, model_count in zip(present_subdirs, model_counts):
+                    if model_count:
+                        self.logger.info(f"   📂 {subdir}: {model_count} Models")
+                        found_types.append(subdir)
+                    else:
+                        self.logger.info(f"   📂 {subdir}: Directory exists, but empty")
 
                 if found_types:
-                    print(f"🎯 Models available in: {', '.join(found_types)}")
+                    self.logger.info(
+                        f"🎯 Models available in: {', '.join(found_types)}"
+                    )
                     return True
                 else:
-                    print(f"⚠️ Symlink created, but no models found!")
+                    self.logger.warning(f"⚠️ Symlink created, but no models found!")
                     return False
             else:
-                print(f"❌ Symlink creation failed!")
+                self.logger.error(f"❌ Symlink creation failed!")
                 return False
 
         except Exception as e:
-            print(f"❌ Volume Model Setup Error: {e}")
-            print(f"📋 Traceback: {traceback.format_exc()}")
+            self.logger.error(f"❌ Volume Model Setup Error: {e}")
+            self.logger.error(f"📋 Traceback: {traceback.format_exc()}")
             return False
 
+    def _remove_local_models_dir(self, path: Path) -> None:
+        """Get a local models directory out of the way without blocking on it
+
+        An empty directory is removed with a single rmdir(). Otherwise the tree
+        is renamed aside (atomic on the same filesystem) and deleted in a
+        background thread; rmtree in place is the last resort.
+        """
+        try:
+            os.rmdir(path)
+            return
+        except OSError:
+            pass
+
+        trash_path = path.with_name(f"{path.name}.trash-{uuid.uuid4().hex[:8]}")
+        try:
+            os.rename(path, trash_path)
+        except OSError:
+            shutil.rmtree(path)
+            return
+
+        threading.Thread(
+            target=shutil.rmtree,
+            args=(trash_path,),
+            kwargs={"ignore_errors": True},
+            name="models-trash-cleanup",
+            daemon=True,
+        ).start()
+
+    def _stat_dir(self, path) -> Optional[os.stat_result]:
+        """Return os.stat() of path if it is a directory, else None"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st if stat.S_ISDIR(st.st_mode) else None
+
+    def _symlink_target(self, path: Path) -> str:
+        """Return the raw target of a symlink for logging"""
+        try:
+            return os.readlink(path)
+        except OSError:
+            return "?"
+
+    def _count_model_files(self, directory: Path) -> Optional[int]:
+        """Count model files directly inside directory (non-recursive)
+
+        Returns:
+            Number of .safetensors/.ckpt files, or None if the directory is missing
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return sum(
+                    1
+                    for entry in entries
+                    if entry.name.endswith((".safetensors", ".ckpt"))
+                    and entry.is_file()
+                )
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        except OSError:
+            return 0
+
     def _is_comfyui_running(self) -> bool:
-        """Check if ComfyUI is already running"""
+        """Check if ComfyUI is already running
+
+        A plain TCP connect to the ComfyUI port is enough here: ComfyUI only
+        starts listening once it is initialized. _wait_for_comfyui still probes
+        /system_stats over HTTP when readiness of the app itself matters.
+        """
+        address = (
+            config.get("comfy_host", "127.0.0.1"),
+            config.get("comfy_port", 8188),
+        )
         try:
-            base_url = config.get_comfyui_base_url()
-            response = requests.get(f"{base_url}/system_stats", timeout=2)
-            if response.status_code == 200:
+            with socket.create_connection(address, timeout=0.2):
                 return True
-        except requests.exceptions.RequestException:
-            pass
-        return False
+        except OSError:
+            return False
 
-    def _check_process_health(self, i: int, max_retries: int) -> bool:
+    def _check_process_health(self, attempt: int, elapsed: float) -> bool:
         """Check if ComfyUI process has exited unexpectedly
 
         Args:
-            i: Current attempt number (0-indexed)
-            max_retries: Maximum number of retries
+            attempt: Current probe number (1-indexed)
+            elapsed: Seconds spent waiting for startup so far
 
         Returns:
             True if process is still running or not yet started, False if process has exited unexpectedly
@@ -271,51 +489,73 @@ class ComfyUIManager:
         if self._comfyui_process:
             return_code = self._comfyui_process.poll()
             if return_code is not None:
-                print(
-                    f"❌ ComfyUI process exited while waiting for startup (exit code: {return_code}, attempt {i + 1}/{max_retries})"
+                self.logger.error(
+                    f"❌ ComfyUI process exited while waiting for startup (exit code: {return_code}, attempt {attempt}, after {elapsed:.1f}s)"
                 )
                 self._tail_comfyui_logs()
                 self._comfyui_process = None
                 return False
         return True
 
-    def _wait_for_comfyui(self, max_retries: int = None, delay: int = 2) -> bool:
-        """Wait until ComfyUI is ready"""
+    def _wait_for_comfyui(
+        self,
+        timeout: Optional[float] = None,
+        initial_delay: float = 0.25,
+        max_delay: float = 5.0,
+    ) -> bool:
+        """Wait until ComfyUI is ready
+
+        Probes /system_stats with exponential backoff and +/-50% jitter, so a fast
+        (warm) start is detected within a fraction of a second while long cold
+        starts are polled at most every max_delay seconds.
+        """
         # Use configured timeout or default
-        if max_retries is None:
-            timeout_seconds = config.get("comfy_startup_timeout", 600)
-            max_retries = timeout_seconds // delay
+        if timeout is None:
+            timeout = config.get("comfy_startup_timeout", 600)
 
         base_url = config.get_comfyui_base_url()
-        print(
-            f"⏳ Waiting for ComfyUI to start (timeout: {max_retries * delay}s = {max_retries * delay / 60:.1f} min)..."
+        self.logger.info(
+            f"⏳ Waiting for ComfyUI to start (timeout: {timeout}s = {timeout / 60:.1f} min)..."
         )
 
-        for i in range(max_retries):
-            if not self._check_process_health(i, max_retries):
+        start = time.monotonic()
+        deadline = start + timeout
+        delay = initial_delay
+        attempt = 0
+        last_progress_log = 0.0
+
+        while True:
+            attempt += 1
+            if not self._check_process_health(attempt, time.monotonic() - start):
                 return False
 
             try:
-                response = requests.get(f"{base_url}/system_stats", timeout=5)
+                response = self._session.get(f"{base_url}/system_stats", timeout=5)
                 if response.status_code == 200:
-                    elapsed = (i + 1) * delay
-                    print(
-                        f"✅ ComfyUI is running (started after ~{elapsed}s = {elapsed / 60:.1f} min)"
+                    elapsed = time.monotonic() - start
+                    self.logger.info(
+                        f"✅ ComfyUI is running (started after ~{elapsed:.1f}s = {elapsed / 60:.1f} min)"
                     )
                     return True
             except requests.exceptions.RequestException:
                 pass
 
-            if i < max_retries - 1:
-                if (i + 1) % 5 == 0:
-                    elapsed = (i + 1) * delay
-                    print(
-                        f"⏳ Still waiting for ComfyUI... ({elapsed}s / {max_retries * delay}s)"
-                    )
-                time.sleep(delay)
+            now = time.monotonic()
+            if now >= deadline:
+                break
 
-        print(
-            f"❌ ComfyUI failed to start after {max_retries * delay}s ({max_retries * delay / 60:.1f} min)!"
+            elapsed = now - start
+            if elapsed - last_progress_log >= _PROGRESS_LOG_INTERVAL:
+                self.logger.info(
+                    f"⏳ Still waiting for ComfyUI... ({int(elapsed)}s / {timeout}s)"
+                )
+                last_progress_log = elapsed
+
+            time.sleep(min(delay * random.uniform(0.5, 1.5), deadline - now))
+            delay = min(max_delay, delay * 2)
+
+        self.logger.error(
+            f"❌ ComfyUI failed to start after {timeout}s ({timeout / 60:.1f} min)!"
         )
         return False
 
@@ -326,98 +566,155 @@ class ComfyUIManager:
             "stderr": self._comfyui_logs_path / "comfyui_stderr.log",
         }
 
+        separator = "=" * 60
         for label, path in log_files.items():
-            print("=" * 60)
-            print(f"📋 Last {lines} lines of ComfyUI {label} log ({path}):")
-            print("=" * 60)
             try:
-                if not path.exists():
-                    print(f"⚠️ Log file {path} does not exist.")
-                    continue
-                with open(path, "r") as log_file:
-                    # Use deque with maxlen for memory-efficient tail operation
-                    tail_lines = deque(log_file, maxlen=lines)
-                    for line in tail_lines:
-                        print(line.rstrip())
+                tail_lines = self._read_tail_lines(path, lines)
+            except FileNotFoundError:
+                self.logger.warning(f"⚠️ Log file {path} does not exist.")
+                continue
             except Exception as error:
-                print(f"⚠️ Could not read {path.name}: {error}")
-        print("=" * 60)
+                self.logger.warning(f"⚠️ Could not read {path.name}: {error}")
+                continue
+            # Emit the whole tail as one record instead of one write per line;
+            # logged as an error since it is only shown when startup fails
+            self.logger.error(
+                "\n".join(
+                    [
+                        separator,
+                        f"📋 Last {lines} lines of ComfyUI {label} log ({path}):",
+                        separator,
+                        *(line.rstrip() for line in tail_lines),
+                        separator,
+                    ]
+                )
+            )
+
+    def _read_tail_lines(
+        self, path: Path, lines: int, chunk_size: int = 16384
+    ) -> List[str]:
+        """Read the last lines of a file by seeking to its final chunk
+
+        Reads at most chunk_size bytes regardless of the log size; a very long
+        tail may therefore return fewer than the requested number of lines.
+        """
+        with open(path, "rb") as log_file:
+            size = log_file.seek(0, os.SEEK_END)
+            offset = max(0, size - chunk_size)
+            log_file.seek(offset)
+            data = log_file.read()
+        tail_lines = data.decode("utf-8", errors="replace").splitlines()
+        if offset and tail_lines:
+            # The first line is most likely cut in half by the seek
+            tail_lines = tail_lines[1:]
+        return tail_lines[-lines:]
+
+    def _checkpoints_visible(self) -> bool:
+        """Check whether ComfyUI already lists at least one checkpoint"""
+        from .workflow_processor import extract_checkpoint_names
+
+        base_url = config.get_comfyui_base_url()
+        try:
+            response = self._session.get(
+                f"{base_url}/object_info/CheckpointLoaderSimple", timeout=2
+            )
+            if response.status_code != 200:
+                return False
+            return bool(extract_checkpoint_names(response.json()))
+        except (requests.exceptions.RequestException, ValueError):
+            return False
 
     def _force_model_refresh(self) -> bool:
         """Attempt model refresh via manager endpoint, fallback to direct scan"""
-        print("🔄 Force Model Refresh after symlink creation...")
+        self.logger.info("🔄 Force Model Refresh after symlink creation...")
         base_url = config.get_comfyui_base_url()
         manager_root = f"{base_url}/manager"
 
         try:
-            discovery_response = requests.get(manager_root, timeout=5)
-            print(f"📋 Manager Discovery Status: {discovery_response.status_code}")
+            discovery_response = self._session.get(manager_root, timeout=5)
+            self.logger.info(
+                f"📋 Manager Discovery Status: {discovery_response.status_code}"
+            )
         except requests.exceptions.RequestException as discovery_error:
-            print(f"⚠️ Manager Endpoint Discovery failed: {discovery_error}")
+            self.logger.warning(
+                f"⚠️ Manager Endpoint Discovery failed: {discovery_error}"
+            )
             return self._direct_model_refresh()
 
         if discovery_response.status_code == 404:
-            print("⚠️ Manager Plugin not available (404)")
+            self.logger.warning("⚠️ Manager Plugin not available (404)")
             return self._direct_model_refresh()
 
         if discovery_response.status_code >= 500:
-            print(
+            self.logger.warning(
                 f"⚠️ Manager Discovery error code {discovery_response.status_code}, using fallback"
             )
             return self._direct_model_refresh()
 
         try:
-            refresh_response = requests.post(f"{manager_root}/reboot", timeout=10)
-            print(f"📋 Manager Refresh Status: {refresh_response.status_code}")
+            refresh_response = self._session.post(f"{manager_root}/reboot", timeout=10)
+            self.logger.info(
+                f"📋 Manager Refresh Status: {refresh_response.status_code}"
+            )
             if refresh_response.status_code == 200:
-                time.sleep(3)
+                # Wait for the old server to actually go down so the readiness
+                # probe below cannot hit it before the reboot
+                self._wait_until(
+                    lambda: not self._is_comfyui_running(), timeout=5, interval=0.1
+                )
                 if not self._wait_for_comfyui():
-                    print("⚠️ ComfyUI restart after Model Refresh failed")
+                    self.logger.warning("⚠️ ComfyUI restart after Model Refresh failed")
                     return False
-                print("✅ Model Refresh successful!")
+                self.logger.info("✅ Model Refresh successful!")
                 return True
-            print("⚠️ Manager Refresh not successful, trying Direct Scan")
+            self.logger.warning("⚠️ Manager Refresh not successful, trying Direct Scan")
         except requests.exceptions.RequestException as refresh_error:
-            print(f"⚠️ Manager Refresh failed: {refresh_error}")
+            self.logger.warning(f"⚠️ Manager Refresh failed: {refresh_error}")
 
         return self._direct_model_refresh()
 
     def _direct_model_refresh(self) -> bool:
         """Trigger a direct model refresh via the object_info endpoint"""
         try:
-            print("🔄 Alternative: Direct Model Scan...")
+            self.logger.info("🔄 Alternative: Direct Model Scan...")
             base_url = config.get_comfyui_base_url()
-            refresh_response = requests.get(
+            refresh_response = self._session.get(
                 f"{base_url}/object_info/CheckpointLoaderSimple",
                 params={"refresh": "true"},
                 timeout=10,
             )
-            print(f"📋 Direct Refresh Response: {refresh_response.status_code}")
+            self.logger.info(
+                f"📋 Direct Refresh Response: {refresh_response.status_code}"
+            )
             return refresh_response.status_code == 200
         except requests.exceptions.RequestException as error:
-            print(f"⚠️ Direct refresh failed: {error}")
+            self.logger.warning(f"⚠️ Direct refresh failed: {error}")
             return False
 
     def _start_comfyui_if_needed(self) -> bool:
         """Start ComfyUI if it's not already running with serverless optimizations"""
         # Check if ComfyUI is already running
         if self._is_comfyui_running():
-            print("✅ ComfyUI is already running, skipping startup")
+            self.logger.info("✅ ComfyUI is already running, skipping startup")
             if self._comfyui_process and self._comfyui_process.poll() is None:
-                print(
+                self.logger.info(
                     f"📋 Using existing ComfyUI process (PID: {self._comfyui_process.pid})"
                 )
             return True
 
         # If we have a stale process reference, clear it
         if self._comfyui_process and self._comfyui_process.poll() is not None:
-            print("🔄 Clearing stale ComfyUI process reference")
+            self.logger.info("🔄 Clearing stale ComfyUI process reference")
             self._comfyui_process = None
 
-        print("🚀 Starting ComfyUI in background with optimal settings...")
+        self.logger.info("🚀 Starting ComfyUI in background with optimal settings...")
         detected_version = self._detect_comfyui_version()
-        print(f"🧭 Detected ComfyUI version: {detected_version}")
-        self._log_gpu_info()
+        self.logger.info(f"🧭 Detected ComfyUI version: {detected_version}")
+        if self._gpu_probe is not None:
+            # Probe was started alongside volume setup; just wait for its output
+            self._gpu_probe.join()
+        else:
+            self._log_gpu_info()
 
         # Build ComfyUI command with base arguments
         comfy_cmd = [
@@ -436,7 +733,8 @@ class ComfyUIManager:
         ]
 
         # Add optional arguments based on config
-        if config.get("enable_torch_compile", False):
+        torch_compile_enabled = config.get("enable_torch_compile", False)
+        if torch_compile_enabled:
             comfy_cmd.append("--enable-compile")
         if config.get("disable_smart_memory", False):
             comfy_cmd.append("--disable-smart-memory")
@@ -449,11 +747,11 @@ class ComfyUIManager:
             try:
                 comfy_cmd.extend(shlex.split(extra_args))
             except Exception as e:
-                print(
+                self.logger.warning(
                     f"⚠️ Could not parse COMFY_EXTRA_ARGS: '{extra_args}' - {type(e).__name__}: {e}"
                 )
-                traceback.print_exc()
-        print(f"🎯 ComfyUI Start Command: {' '.join(comfy_cmd)}")
+                self.logger.debug(f"Traceback: {traceback.format_exc()}")
+        self.logger.info(f"🎯 ComfyUI Start Command: {' '.join(comfy_cmd)}")
 
         # Create log files for debugging
         self._comfyui_logs_path.mkdir(exist_ok=True)
@@ -461,9 +759,11 @@ class ComfyUIManager:
         stderr_log = self._comfyui_logs_path / "comfyui_stderr.log"
 
         try:
-            with open(stdout_log, "a") as stdout_file, open(
-                stderr_log, "a"
-            ) as stderr_file:
+            # The child writes through dup'd fds, so a buffered Python file
+            # object on our side would only add overhead
+            with self._open_log_fd(stdout_log) as stdout_fd, self._open_log_fd(
+                stderr_log
+            ) as stderr_fd:
 
                 # Prepare environment with performance flags
                 # These environment variables are consumed by sitecustomize.py, which calls
@@ -472,6 +772,9 @@ class ComfyUIManager:
                 child_env = os.environ.copy()
                 # Prevent early torch import via sitecustomize while ComfyUI initializes
                 child_env["SKIP_TORCH_OPTIMIZATIONS"] = "1"
+                # Skip .pyc writes on the read-mostly image and flush logs immediately
+                child_env["PYTHONDONTWRITEBYTECODE"] = "1"
+                child_env["PYTHONUNBUFFERED"] = "1"
                 child_env["ENABLE_TF32"] = (
                     "1" if config.get("enable_tf32", True) else "0"
                 )
@@ -482,7 +785,7 @@ class ComfyUIManager:
                     config.get("matmul_precision", "high")
                 )
 
-                if config.get("enable_torch_compile", False):
+                if torch_compile_enabled:
                     child_env["ENABLE_TORCH_COMPILE"] = "1"
                     child_env["COMFY_ENABLE_COMPILE"] = "1"
                     child_env["TORCH_COMPILE_MODE"] = str(
@@ -500,18 +803,22 @@ class ComfyUIManager:
 
                 self._comfyui_process = subprocess.Popen(
                     comfy_cmd,
-                    stdout=stdout_file,
-                    stderr=stderr_file,
-                    cwd=str(self._comfyui_path),
+                    stdout=stdout_fd,
+                    stderr=stderr_fd,
+                    cwd=self._comfyui_path_str,
                     env=child_env,
                 )
 
-                print(f"📋 ComfyUI process started (PID: {self._comfyui_process.pid})")
-                print(f"📝 Logs: stdout={stdout_log}, stderr={stderr_log}")
+                self.logger.info(
+                    f"📋 ComfyUI process started (PID: {self._comfyui_process.pid})"
+                )
+                self.logger.info(f"📝 Logs: stdout={stdout_log}, stderr={stderr_log}")
 
                 # Wait until ComfyUI is ready
                 if not self._wait_for_comfyui():
-                    print("❌ ComfyUI failed to start, check logs for details")
+                    self.logger.error(
+                        "❌ ComfyUI failed to start, check logs for details"
+                    )
                     if self._comfyui_process:
                         self._tail_comfyui_logs()
 
@@ -521,8 +828,8 @@ class ComfyUIManager:
                 if config.get_workflow_config().get("enable_startup_warmup", True):
                     try:
                         base_url = config.get_comfyui_base_url()
-                        requests.get(f"{base_url}/object_info", timeout=5)
-                        print("🔥 Startup warmup: object_info primed")
+                        self._session.get(f"{base_url}/object_info", timeout=5)
+                        self.logger.info("🔥 Startup warmup: object_info primed")
                     except requests.exceptions.RequestException:
                         # Warmup request failure is non-critical and does not affect server startup.
                         # It is safe to ignore this exception.
@@ -531,94 +838,124 @@ class ComfyUIManager:
                 return True
 
         except Exception as e:
-            print(f"❌ Failed to start ComfyUI: {e}")
-            print(f"📋 Traceback: {traceback.format_exc()}")
+            self.logger.error(f"❌ Failed to start ComfyUI: {e}")
+            self.logger.error(f"📋 Traceback: {traceback.format_exc()}")
             return False
 
+    @contextmanager
+    def _open_log_fd(self, path: Path):
+        """Open a log file as a raw append-only fd and close it afterwards"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            yield fd
+        finally:
+            os.close(fd)
+
     def run_workflow(self, workflow: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Execute ComfyUI workflow"""
-        from .workflow_processor import workflow_processor
+        from .workflow_processor import (
+            WorkflowView,
+            count_workflow_nodes,
+            extract_checkpoint_names,
+            find_save_nodes,
+            get_workflow_node_ids,
+        )
 
         base_url = config.get_comfyui_base_url()
         client_id = str(uuid.uuid4())
         workflow_start_time = time.time()
+        event_socket = None
 
         try:
-            print(f"📤 Sending workflow to ComfyUI API...")
-            print(f"🔗 URL: {base_url}/prompt")
-            print(f"🆔 Client ID: {client_id}")
-            print(
-                f"📋 Workflow Node Count: {workflow_processor.count_workflow_nodes(workflow)}"
+            self.logger.info(f"📤 Sending workflow to ComfyUI API...")
+            self.logger.info(f"🔗 URL: {base_url}/prompt")
+            self.logger.info(f"🆔 Client ID: {client_id}")
+            # Index the nodes once for all the node queries below
+            workflow_view = WorkflowView(workflow)
+            self.logger.info(
+                f"📋 Workflow Node Count: {count_workflow_nodes(workflow_view)}"
             )
-            print(
-                f"🔍 Workflow Nodes: {workflow_processor.get_workflow_node_ids(workflow)}"
+            self.logger.info(
+                f"🔍 Workflow Nodes: {get_workflow_node_ids(workflow_view)}"
             )
 
             # Test system stats
-            print(f"🔄 Testing ComfyUI System Stats...")
-            stats_response = requests.get(f"{base_url}/system_stats", timeout=10)
-            print(f"✅ System Stats: {stats_response.status_code}")
+            self.logger.info(f"🔄 Testing ComfyUI System Stats...")
+            stats_response = self._session.get(f"{base_url}/system_stats", timeout=10)
+            self.logger.info(f"✅ System Stats: {stats_response.status_code}")
 
             # Test available models
-            print(f"🔄 Testing available models...")
-            models_response = requests.get(f"{base_url}/object_info", timeout=10)
+            self.logger.info(f"🔄 Testing available models...")
+            models_response = self._session.get(f"{base_url}/object_info", timeout=10)
             if models_response.status_code == 200:
                 object_info = models_response.json()
-                checkpoints = workflow_processor.extract_checkpoint_names(object_info)
-                print(f"📋 Available Checkpoints: {checkpoints}")
+                checkpoints = extract_checkpoint_names(object_info)
+                self.logger.info(f"📋 Available Checkpoints: {checkpoints}")
                 if not checkpoints:
-                    print("⚠️ No checkpoints found!")
+                    self.logger.warning("⚠️ No checkpoints found!")
 
             # Check output directory
             output_dir = config.get_workspace_config()["comfyui_output_path"]
-            print(
+            self.logger.info(
                 f"📁 Output Dir: {output_dir}, exists: {output_dir.exists()}, writable: {os.access(output_dir, os.W_OK) if output_dir.exists() else False}"
             )
 
             # Count SaveImage nodes
-            save_nodes = workflow_processor.find_save_nodes(workflow)
-            print(f"💾 SaveImage Nodes found: {len(save_nodes)}")
+            save_nodes = find_save_nodes(workflow_view)
+            self.logger.info(f"💾 SaveImage Nodes found: {len(save_nodes)}")
+
+            # Subscribe before submitting so no completion event can be missed
+            event_socket = self._open_event_socket(base_url, client_id)
 
-            print(f"🚀 Sending workflow with client_id...")
+            self.logger.info(f"🚀 Sending workflow with client_id...")
 
-            response = requests.post(
+            response = self._session.post(
                 f"{base_url}/prompt",
                 json={"prompt": workflow, "client_id": client_id},
                 timeout=30,
             )
 
-            print(f"📤 Response Status: {response.status_code}")
-            print(f"📤 Response Headers: {dict(response.headers)}")
+            self.logger.info(f"📤 Response Status: {response.status_code}")
+            self.logger.info(f"📤 Response Headers: {dict(response.headers)}")
 
             if response.status_code != 200:
-                print(f"📜 Response Body: {response.text}")
+                self.logger.error(f"📜 Response Body: {response.text}")
                 return None
 
             result = response.json()
             prompt_id = result.get("prompt_id")
 
             if not prompt_id:
-                print(f"❌ No prompt_id received: {result}")
+                self.logger.error(f"❌ No prompt_id received: {result}")
                 return None
 
-            print(f"✅ Workflow sent. Prompt ID: {prompt_id}")
+            self.logger.info(f"✅ Workflow sent. Prompt ID: {prompt_id}")
 
             # Wait for completion
-            workflow_config = config.get_workflow_config()
-            max_wait = workflow_config["max_wait_time"]
-            poll_interval = workflow_config["poll_interval"]
-            print(
+            max_wait = config.MAX_WAIT_TIME
+            poll_interval = config.POLL_INTERVAL
+            self.logger.info(
                 f"⏳ Workflow execution timeout: {max_wait}s ({max_wait / 60:.0f} min)"
             )
 
+            history_url = f"{base_url}/history/{prompt_id}"
             start_time = time.monotonic()
+            last_progress_log = 0.0
+            if event_socket is not None:
+                # Wait until ComfyUI reports the prompt finished; the history
+                # loop below then only has to fetch the result once. If the
+                # socket drops we simply keep polling from here.
+                finished = self._wait_for_prompt_event(
+                    event_socket, prompt_id, start_time, max_wait, poll_interval
+                )
+                event_socket = None
+                if not finished and self._comfyui_process_exited():
+                    return None
             while True:
                 elapsed = time.monotonic() - start_time
 
                 try:
-                    history_response = requests.get(
-                        f"{base_url}/history/{prompt_id}", timeout=10
-                    )
+                    history_response = self._session.get(history_url, timeout=10)
                     if history_response.status_code == 200:
                         history = history_response.json()
                         if prompt_id in history:
@@ -626,35 +963,128 @@ class ComfyUIManager:
                             status = prompt_history.get("status", {})
 
                             if status.get("status_str") == "success":
-                                print(f"✅ Workflow completed successfully!")
+                                self.logger.info(f"✅ Workflow completed successfully!")
                                 prompt_history["_workflow_start_time"] = (
                                     workflow_start_time
                                 )
                                 return prompt_history
                             elif status.get("status_str") == "error":
-                                print(f"❌ Workflow Error: {status}")
+                                self.logger.error(f"❌ Workflow Error: {status}")
                                 return None
 
                 except requests.exceptions.RequestException as e:
-                    print(f"⚠️ History API Error: {e}")
+                    self.logger.warning(f"⚠️ History API Error: {e}")
 
                 if elapsed >= max_wait:
-                    print(
+                    self.logger.warning(
                         f"⏰ Workflow Timeout after {int(elapsed)}s (max: {max_wait}s)"
                     )
                     return None
 
                 remaining = max_wait - elapsed
                 sleep_time = min(poll_interval, remaining)
-                print(f"⏳ Workflow running... ({int(elapsed)}s / {max_wait}s)")
+                if elapsed - last_progress_log >= _PROGRESS_LOG_INTERVAL:
+                    self.logger.info(
+                        f"⏳ Workflow running... ({int(elapsed)}s / {max_wait}s)"
+                    )
+                    last_progress_log = elapsed
                 time.sleep(sleep_time)
 
         except requests.exceptions.RequestException as e:
-            print(f"❌ ComfyUI API Error: {e}")
+            self.logger.error(f"❌ ComfyUI API Error: {e}")
             return None
         except Exception as e:
-            print(f"❌ Workflow Error: {e}")
+            self.logger.error(f"❌ Workflow Error: {e}")
             return None
+        finally:
+            if event_socket is not None:
+                event_socket.close()
+
+    def _open_event_socket(self, base_url: str, client_id: str):
+        """Open the ComfyUI WebSocket for client_id, or None if unavailable"""
+        if websocket is None:
+            return None
+        ws_url = f"ws{base_url[len('http'):]}/ws?clientId={client_id}"
+        try:
+            return websocket.create_connection(ws_url, timeout=10)
+        except Exception as e:
+            self.logger.warning(
+                f"⚠️ WebSocket unavailable ({e}), falling back to history polling"
+            )
+            return None
+
+    def _comfyui_process_exited(self) -> bool:
+        """Log and report whether the ComfyUI process we launched has exited"""
+        if self._comfyui_process is None:
+            return False
+        return_code = self._comfyui_process.poll()
+        if return_code is None:
+            return False
+        self.logger.error(
+            f"❌ ComfyUI process exited while running the workflow (exit code: {return_code})"
+        )
+        return True
+
+    def _wait_for_prompt_event(
+        self,
+        ws,
+        prompt_id: str,
+        start_time: float,
+        max_wait: float,
+        poll_interval: float,
+    ) -> bool:
+        """Wait for ComfyUI to report that prompt_id finished executing
+
+        ComfyUI sends {"type": "executing", "data": {"node": None}} once the
+        prompt is done and its history entry is stored; execution_error and
+        execution_interrupted end the wait as well. Receives time out every
+        poll_interval seconds to log progress and check that the ComfyUI
+        process is still alive. The socket is always closed.
+
+        Returns:
+            True if a completion event arrived, False on timeout, socket error
+            or when the ComfyUI process exited
+        """
+        deadline = start_time + max_wait
+        last_progress_log = 0.0
+        try:
+            while True:
+                now = time.monotonic()
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                elapsed = now - start_time
+                if elapsed - last_progress_log >= _PROGRESS_LOG_INTERVAL:
+                    self.logger.info(
+                        f"⏳ Workflow running... ({int(elapsed)}s / {max_wait}s)"
+                    )
+                    last_progress_log = elapsed
+                ws.settimeout(min(poll_interval, remaining))
+                try:
+                    message = ws.recv()
+                except websocket.WebSocketTimeoutException:
+                    if self._comfyui_process_exited():
+                        return False
+                    continue
+                # Binary frames carry preview images; only text frames are events
+                if not isinstance(message, str):
+                    continue
+                event = json.loads(message)
+                data = event.get("data") or {}
+                if data.get("prompt_id") != prompt_id:
+                    continue
+                event_type = event.get("type")
+                if event_type == "executing" and data.get("node") is None:
+                    return True
+                if event_type in ("execution_error", "execution_interrupted"):
+                    return True
+        except Exception as e:
+            self.logger.warning(
+                f"⚠️ WebSocket error ({e}), falling back to history polling"
+            )
+            return False
+        finally:
+            ws.close()
 
     def find_generated_images(
         self, result: Dict[str, Any], workflow_start_time: float
@@ -663,6 +1093,9 @@ class ComfyUIManager:
 
         image_paths = []
         outputs = result.get("outputs", {})
+        workspace_config = config.get_workspace_config()
+        output_dir = workspace_config["comfyui_output_path"]
+        output_dir_str = workspace_config["comfyui_output_path_str"]
 
         # Search all output nodes for images
         expected_files = []
@@ -673,63 +1106,108 @@ class ComfyUIManager:
                     subfolder = img_info.get("subfolder", "")
                     if filename:
                         if subfolder:
-                            full_path = (
-                                config.get_workspace_config()["comfyui_output_path"]
-                                / subfolder
-                                / filename
-                            )
+                            full_path = output_dir / subfolder / filename
                         else:
-                            full_path = (
-                                config.get_workspace_config()["comfyui_output_path"]
-                                / filename
-                            )
-
+                            full_path = output_dir / filename
                         expected_files.append(full_path)
-                        if full_path.exists():
-                            image_paths.append(full_path)
-                            print(f"🖼️ Found: {full_path.name}")
+
+        # Answer existence from one directory listing per unique subfolder
+        # instead of a stat per image
+        listed_names = {
+            directory: self._list_dir_names(directory)
+            for directory in {full_path.parent for full_path in expected_files}
+        }
+
+        for full_path in expected_files:
+            if full_path.name in listed_names[full_path.parent]:
+                image_paths.append(full_path)
+                self.logger.info(f"🖼️ Found: {full_path.name}")
 
         # Fallback: Search output directory recursively for new images
         if not image_paths:
-            print(
+            self.logger.info(
                 "🔍 Fallback: Recursively searching output directory for images created after workflow start..."
             )
-            output_dir = config.get_workspace_config()["comfyui_output_path"]
-            if output_dir.exists():
-                supported_extensions = config.get_supported_extensions()
-                cutoff_time = workflow_start_time
-
-                for ext in supported_extensions["image"]:
-                    for img_path in output_dir.rglob(ext):
-                        if img_path.stat().st_mtime > cutoff_time:
-                            image_paths.append(img_path)
-                            rel_path = img_path.relative_to(output_dir)
-                            print(
-                                f"🖼️ New image found: {rel_path} (mtime: {img_path.stat().st_mtime}, cutoff: {cutoff_time})"
-                            )
-
-                if not image_paths:
-                    print(
-                        f"⚠️ No images found created after {cutoff_time} (workflow start time)"
+            supported_extensions = config.get_supported_extensions()
+            cutoff_time = workflow_start_time
+            suffixes = tuple(ext.lstrip("*") for ext in supported_extensions["image"])
+
+            # One scandir walk covers every extension and yields the mtimes from
+            # the DirEntry stat; an unreadable or missing dir just yields nothing.
+            # Paths come from scandir under output_dir, so relative paths are a
+            # prefix slice instead of a PurePath per entry.
+            scanned_files = self._scan_files_with_mtime(output_dir_str, suffixes)
+            prefix_len = len(output_dir_str) + len(os.sep)
+
+            for file_path, mtime in scanned_files:
+                if mtime > cutoff_time:
+                    image_paths.append(Path(file_path))
+                    self.logger.info(
+                        f"🖼️ New image found: {file_path[prefix_len:]} (mtime: {mtime}, cutoff: {cutoff_time})"
                     )
 
-                    # List recent files for debugging
-                    recent_files = []
-                    for ext in supported_extensions["image"]:
-                        recent_files.extend(output_dir.rglob(ext))
-                    recent_files = sorted(
-                        recent_files, key=lambda p: p.stat().st_mtime, reverse=True
-                    )[:5]
-                    if recent_files:
-                        print(f"📋 Most recent images in output directory:")
-                        for f in recent_files:
-                            rel_path = f.relative_to(output_dir)
-                            print(f"   - {rel_path} (mtime: {f.stat().st_mtime})")
+            if not image_paths:
+                self.logger.warning(
+                    f"⚠️ No images found created after {cutoff_time} (workflow start time)"
+                )
+
+                # List recent files for debugging, reusing the scan above
+                recent_files = heapq.nlargest(5, scanned_files, key=itemgetter(1))
+                if recent_files:
+                    self.logger.info(f"📋 Most recent images in output directory:")
+                    for file_path, mtime in recent_files:
+                        self.logger.info(
+                            f"   - {file_path[prefix_len:]} (mtime: {mtime})"
+                        )
 
         return image_paths
 
+    def _list_dir_names(self, directory: Path) -> frozenset:
+        """Return the entry names of a directory, empty if it cannot be read"""
+        try:
+            with os.scandir(directory) as entries:
+                return frozenset(entry.name for entry in entries)
+        except OSError:
+            return frozenset()
+
+    def _scan_files_with_mtime(
+        self, root: Union[str, Path], suffixes: Tuple[str, ...]
+    ) -> List[Tuple[str, float]]:
+        """Recursively collect (path, mtime) for files under root matching suffixes
+
+        Uses os.scandir so the mtime comes from the cached DirEntry stat instead of
+        a separate stat() call per file.
+        """
+        found = []
+        pending = [os.fspath(root)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.endswith(suffixes):
+                            found.append(
+                                (entry.path, entry.stat(follow_symlinks=False).st_mtime)
+                            )
+            except OSError:
+                continue
+        return found
+
+    def _start_gpu_probe(self) -> None:
+        """Run the GPU diagnostics in a background thread to overlap driver init"""
+        if not config.get("log_gpu_info", True):
+            return
+        self._gpu_probe = threading.Thread(
+            target=self._log_gpu_info, name="gpu-probe", daemon=True
+        )
+        self._gpu_probe.start()
+
     def _log_gpu_info(self) -> None:
         """Log basic GPU information for diagnostics in serverless context"""
+        if not config.get("log_gpu_info", True):
+            return
+
         try:
             # Avoid importing torch before ComfyUI startup; use nvidia-smi for diagnostics
             result = subprocess.run(
@@ -752,71 +1230,117 @@ class ComfyUIManager:
                     # Expected nvidia-smi output: "name, memory.total [MiB], compute_cap"
                     if len(parts) >= 3:
                         name, vram, cc = parts[:3]
-                        print(f"🎛️  GPU: {name} | VRAM: {vram} | CC: {cc}")
+                        self.logger.info(f"🎛️  GPU: {name} | VRAM: {vram} | CC: {cc}")
                         gpu_info_logged = True
                     else:
-                        print(f"🧩 GPU: {line}")
+                        self.logger.info(f"🧩 GPU: {line}")
                         gpu_info_logged = True
-            
+
             # Fallback minimal signal if GPU info wasn't logged
             if not gpu_info_logged:
                 visible = os.getenv("NVIDIA_VISIBLE_DEVICES", "unknown")
-                print(f"🧩 CUDA visible devices: {visible}")
+                self.logger.info(f"🧩 CUDA visible devices: {visible}")
         except Exception as e:
             # GPU info logging is non-critical; suppress errors but log if verbose
-            print(f"⚠️ Could not log GPU info: {e}")
+            self.logger.warning(f"⚠️ Could not log GPU info: {e}")
+
+    def _delete_temp_file(self, file_path: Path) -> int:
+        """Delete a single temp file, returning 1 if it was removed, else 0"""
+        try:
+            os.unlink(file_path)
+            return 1
+        except FileNotFoundError:
+            # Already gone - nothing to clean up, and not counted as deleted
+            pass
+        except OSError as e:
+            self.logger.warning(f"⚠️ Could not delete temp file {file_path.name}: {e}")
+        return 0
 
     def cleanup_temp_files(self, file_paths: List[Path]) -> int:
         """Clean up temporary ComfyUI output files"""
-        if not config.get("cleanup_temp_files", True):
-            print("📋 Cleanup disabled via CLEANUP_TEMP_FILES=false")
+        if not self._cleanup_enabled:
+            self.logger.info("📋 Cleanup disabled via CLEANUP_TEMP_FILES=false")
             return 0
 
-        deleted_count = 0
-        for file_path in file_paths:
-            try:
-                if file_path.exists():
-                    file_path.unlink()
-                    deleted_count += 1
-            except Exception as e:
-                print(f"⚠️ Could not delete temp file {file_path.name}: {e}")
+        deleted_count = sum(map(self._delete_temp_file, file_paths))
 
         if deleted_count > 0:
-            print(f"🧹 Cleaned up {deleted_count} temporary file(s)")
+            self.logger.info(f"🧹 Cleaned up {deleted_count} temporary file(s)")
 
         return deleted_count
 
+    def _models_setup_needed(self, models_dir: Path) -> bool:
+        """Check whether the models dir still needs to be linked to the volume
+
+        A single lstat() answers the common cases (missing path or real directory);
+        only an existing symlink needs a follow-up stat to detect a broken target.
+        """
+        try:
+            st = os.lstat(models_dir)
+        except OSError:
+            # Missing, or unreadable (e.g. EACCES/ENOTDIR); re-run the setup
+            return True
+        if not stat.S_ISLNK(st.st_mode):
+            return True
+        return not os.path.exists(models_dir)
+
     def start_server_if_needed(self) -> bool:
         """Start ComfyUI server if needed and setup models"""
+        if self._started_ok:
+            # Only re-run setup if the server has died since; a server we did
+            # not launch ourselves can only be checked on its port
+            if self._comfyui_process is None:
+                alive = self._is_comfyui_running()
+            else:
+                alive = self._comfyui_process.poll() is None
+            if alive:
+                return True
+            self.logger.warning(
+                "⚠️ ComfyUI server is gone since last invocation, restarting"
+            )
+            self._started_ok = False
+
+        # Query the GPU (and wake the NVIDIA driver) while the volume is set up
+        self._start_gpu_probe()
+
         # Volume Models Setup
-        comfy_models_dir = config.get_workspace_config()["comfyui_models_path"]
+        comfy_models_dir = self.comfy_models_dir
         just_setup_models = False
 
-        if not comfy_models_dir.is_symlink() or not comfy_models_dir.exists():
-            print("📦 Setting up Volume Models...")
+        if self._models_setup_needed(comfy_models_dir):
+            self.logger.info("📦 Setting up Volume Models...")
             volume_setup_success = self._setup_volume_models()
             if not volume_setup_success:
-                print(
+                self.logger.warning(
                     "⚠️ Volume Models Setup failed - ComfyUI will start without Volume Models"
                 )
             else:
-                print(
+                # symlink() is visible to every process once it returns, so
+                # ComfyUI can start right away
+                self.logger.info(
                     "✅ Volume Models Setup successful - ComfyUI will find models at startup!"
                 )
-                time.sleep(2)
-                print("🔗 Symlinks stabilized - ComfyUI can now start")
                 just_setup_models = True
 
         # Start ComfyUI if not already running
-        if not self._start_comfyui_if_needed():
+        started = self._start_comfyui_if_needed()
+        # The probe has either been joined or is finishing on its own by now
+        self._gpu_probe = None
+        if not started:
             return False
 
-        # Model refresh only needed after initial setup
-        if just_setup_models and config.get("comfy_refresh_models", True):
-            print("⏳ Waiting for ComfyUI model scanning to initialize...")
-            time.sleep(5)
-            self._force_model_refresh()
+        # Model refresh only needed after initial setup, and only if ComfyUI
+        # did not pick up the checkpoints from the fresh symlink on its own
+        if just_setup_models and self._refresh_enabled:
+            self.logger.info("⏳ Waiting for ComfyUI model scanning to initialize...")
+            if self._wait_until(
+                self._checkpoints_visible, timeout=2, interval=0.1, backoff=2.0
+            ):
+                self.logger.info("✅ Checkpoints visible, skipping Model Refresh")
+            else:
+                self._force_model_refresh()
 
+        self._started_ok = True
         return True
 
 
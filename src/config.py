@@ -3,17 +3,96 @@ Configuration management for RunPod ComfyUI Serverless Handler
 """
 
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Final, Mapping, Optional, Tuple
+
+# Common spellings of boolean env values, matched without lowercasing first
+_TRUTHY = frozenset(
+    ("1", "true", "TRUE", "True", "yes", "YES", "Yes", "on", "ON", "On")
+)
+_FALSY = frozenset(
+    ("0", "false", "FALSE", "False", "no", "NO", "No", "off", "OFF", "Off", "")
+)
+
+# Glob patterns per output type; immutable so it can be handed out directly
+_SUPPORTED_EXTENSIONS = MappingProxyType(
+    {
+        "image": ("*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif"),
+        "video": ("*.mp4", "*.webm", "*.mov", "*.avi"),
+    }
+)
+
+
+@lru_cache(maxsize=1)
+def _env_snapshot() -> Dict[str, str]:
+    """Copy os.environ into a plain dict once
+
+    Reading from the copy skips os.environ's per-key encode/decode wrappers.
+    """
+    return dict(os.environ)
+
+
+def _getenv(key: str, default: Optional[str] = None) -> Optional[str]:
+    """Drop-in replacement for os.getenv served from the env snapshot"""
+    return _env_snapshot().get(key, default)
+
+
+@lru_cache(maxsize=None)
+def _path_env(key: str, default: str) -> Path:
+    """Path from an environment variable, parsed once per process"""
+    return Path(_getenv(key, default))
+
+
+# Fixed container layout, built once at import
+_WORKSPACE_PATH = Path("/workspace")
+_COMFYUI_PATH = _WORKSPACE_PATH / "ComfyUI"
+_COMFYUI_MODELS_PATH = _COMFYUI_PATH / "models"
+_COMFYUI_OUTPUT_PATH = _COMFYUI_PATH / "output"
+_COMFYUI_LOGS_PATH = _WORKSPACE_PATH / "logs"
+_COMFYUI_PATH_STR = sys.intern(str(_COMFYUI_PATH))
+_COMFYUI_OUTPUT_PATH_STR = sys.intern(str(_COMFYUI_OUTPUT_PATH))
 
 
 class Config:
-    """Configuration management class"""
+    """Configuration management class
+
+    Sections are built from the environment on first access, so a cold start
+    only pays for the env lookups of the sections it actually uses.
+    """
+
+    # Fixed workflow timings, readable directly as attributes on hot paths
+    MAX_WAIT_TIME: Final[int] = 3600  # 60 minutes for video rendering
+    POLL_INTERVAL: Final[int] = 5  # seconds
+    DEFAULT_WORKFLOW_DURATION: Final[int] = 60  # seconds
+
+    # Section name -> builder method
+    _SECTION_BUILDERS = {
+        "s3": "_build_s3_config",
+        "volume": "_build_volume_config",
+        "workspace": "_build_workspace_config",
+        "workflow": "_build_workflow_config",
+    }
 
     def __init__(self):
         self._config = {}
         self._logger = None
-        self._load_config()
+        self._core_loaded = False
+        self._comfyui_base_url: Optional[str] = None
+
+    def invalidate_env_cache(self) -> None:
+        """Re-read the environment (e.g. after tests patch os.environ)
+
+        Drops the env snapshot and every section built from it, so the next
+        access rebuilds them from the current environment.
+        """
+        _env_snapshot.cache_clear()
+        _path_env.cache_clear()
+        self._config = {}
+        self._core_loaded = False
+        self._comfyui_base_url = None
 
     @property
     def logger(self):
@@ -24,113 +103,27 @@ class Config:
             self._logger = get_logger("config")
         return self._logger
 
-    def _load_config(self):
-        """Load configuration from environment variables"""
-        # ComfyUI Configuration
-        self._config.update(
-            {
-                "comfy_port": self._parse_int_env("COMFY_PORT", "8188"),
-                "comfy_host": os.getenv("COMFY_HOST", "127.0.0.1"),
-                "comfy_startup_timeout": self._parse_int_env(
-                    "COMFYUI_STARTUP_TIMEOUT", "600"
-                ),  # Default: 10 minutes
-                "randomize_seeds": self._parse_bool_env("RANDOMIZE_SEEDS", "true"),
-                "comfy_refresh_models": self._parse_bool_env(
-                    "COMFYUI_REFRESH_MODELS", "true"
-                ),
-                "cleanup_temp_files": self._parse_bool_env(
-                    "CLEANUP_TEMP_FILES", "true"
-                ),
-                "debug_s3_urls": self._parse_bool_env("DEBUG_S3_URLS", "false"),
-                # Performance flags
-                "enable_torch_compile": self._parse_bool_env(
-                    "ENABLE_TORCH_COMPILE", "false"
-                ),
-                "torch_compile_mode": os.getenv(
-                    "TORCH_COMPILE_MODE", "reduce-overhead"
-                ),
-                "torch_compile_backend": os.getenv("TORCH_COMPILE_BACKEND", "inductor"),
-                "torch_compile_fullgraph": self._parse_bool_env(
-                    "TORCH_COMPILE_FULLGRAPH", "false"
-                ),
-                "torch_compile_dynamic": self._parse_bool_env(
-                    "TORCH_COMPILE_DYNAMIC", "false"
-                ),
-                "enable_tf32": self._parse_bool_env("ENABLE_TF32", "true"),
-                "enable_cudnn_benchmark": self._parse_bool_env(
-                    "ENABLE_CUDNN_BENCHMARK", "true"
-                ),
-                "matmul_precision": os.getenv("MATMUL_PRECISION", "high"),
-                # Additional CLI args for ComfyUI (space-separated)
-                "comfy_extra_args": os.getenv("COMFY_EXTRA_ARGS", ""),
-                # Legacy serverless optimizations (kept for backward compatibility)
-                "disable_smart_memory": self._parse_bool_env(
-                    "DISABLE_SMART_MEMORY", "false"
-                ),
-                "force_fp16": self._parse_bool_env("FORCE_FP16", "false"),
-                "cold_start_optimization": self._parse_bool_env(
-                    "COLD_START_OPTIMIZATION", "true"
-                ),
-                "preload_models": self._parse_bool_env("PRELOAD_MODELS", "false"),
-                "gpu_memory_fraction": self._parse_float_env(
-                    "GPU_MEMORY_FRACTION", "0.9"
-                ),
-            }
-        )
-
-        # S3 Configuration
-        self._config["s3"] = {
-            "bucket": os.getenv("S3_BUCKET"),
-            "access_key": os.getenv("S3_ACCESS_KEY"),
-            "secret_key": os.getenv("S3_SECRET_KEY"),
-            "endpoint_url": os.getenv("S3_ENDPOINT_URL"),
-            "region": os.getenv("S3_REGION", "auto"),
-            "public_url": os.getenv("S3_PUBLIC_URL"),
-            "signed_url_expiry": int(os.getenv("S3_SIGNED_URL_EXPIRY", "3600")),
-            "cache_control": os.getenv("S3_CACHE_CONTROL", "public, max-age=31536000"),
-            "signature_version": os.getenv("S3_SIGNATURE_VERSION", "s3v4"),
-            "addressing_style": os.getenv("S3_ADDRESSING_STYLE", "path"),
-        }
-
-        # Volume Configuration
-        self._config["volume"] = {
-            "runpod_volume_path": Path(
-                os.getenv("RUNPOD_VOLUME_PATH", "/runpod-volume")
-            ),
-            "runpod_output_dir": os.getenv("RUNPOD_OUTPUT_DIR"),
-            "network_volume_timeout": self._parse_int_env(
-                "NETWORK_VOLUME_TIMEOUT", "15"
-            ),
-            "volume_models_dir": os.getenv("VOLUME_MODELS_DIR"),
-        }
-
-        # Workspace Configuration
-        self._config["workspace"] = {
-            "workspace_path": Path("/workspace"),
-            "comfyui_path": Path("/workspace/ComfyUI"),
-            "comfyui_models_path": Path("/workspace/ComfyUI/models"),
-            "comfyui_output_path": Path("/workspace/ComfyUI/output"),
-            "comfyui_logs_path": Path("/workspace/logs"),
-        }
-
-        # Workflow Configuration
-        self._config["workflow"] = {
-            "max_wait_time": 3600,  # 60 minutes for video rendering
-            "poll_interval": 5,  # seconds
-            "default_workflow_duration": 60,  # seconds
-            "enable_startup_warmup": self._parse_bool_env(
-                "ENABLE_STARTUP_WARMUP", "true"
-            ),
-        }
+    def _get_section(self, name: str) -> Dict[str, Any]:
+        """Return a config section, building it on first access"""
+        section = self._config.get(name)
+        if section is None:
+            section = getattr(self, self._SECTION_BUILDERS[name])()
+            self._config[name] = section
+        return section
 
     def _parse_bool_env(self, key: str, default: str = "false") -> bool:
         """Safely parse environment variable as boolean"""
-        value = os.getenv(key, default).lower()
-        return value in {"1", "true", "yes", "on"}
+        value = _getenv(key, default)
+        if value in _TRUTHY:
+            return True
+        if value in _FALSY:
+            return False
+        # Unusual casing such as "tRuE"
+        return value.lower() in _TRUTHY
 
     def _parse_int_env(self, key: str, default: str) -> int:
         """Safely parse environment variable as integer"""
-        value = os.getenv(key, default)
+        value = _getenv(key, default)
         try:
             return int(value)
         except (ValueError, TypeError):
@@ -146,7 +139,7 @@ class Config:
 
     def _parse_float_env(self, key: str, default: str) -> float:
         """Safely parse environment variable as float"""
-        value = os.getenv(key, default)
+        value = _getenv(key, default)
         try:
             return float(value)
         except (ValueError, TypeError):
@@ -160,6 +153,113 @@ class Config:
                     f"[config] ERROR: Invalid default float value for {key}: '{default}' (env value: '{value}')"
                 )
 
+    def _ensure_core_config(self) -> None:
+        """Load the flat top-level keys on first use"""
+        if not self._core_loaded:
+            self._config.update(self._build_core_config())
+            self._core_loaded = True
+
+    def _build_core_config(self) -> Dict[str, Any]:
+        """Build the ComfyUI and performance configuration"""
+        return {
+            "comfy_port": self._parse_int_env("COMFY_PORT", "8188"),
+            "comfy_host": _getenv("COMFY_HOST", "127.0.0.1"),
+            "comfy_startup_timeout": self._parse_int_env(
+                "COMFYUI_STARTUP_TIMEOUT", "600"
+            ),  # Default: 10 minutes
+            "randomize_seeds": self._parse_bool_env("RANDOMIZE_SEEDS", "true"),
+            "log_seed_randomization": self._parse_bool_env(
+                "LOG_SEED_RANDOMIZATION", "false"
+            ),
+            "comfy_refresh_models": self._parse_bool_env(
+                "COMFYUI_REFRESH_MODELS", "true"
+            ),
+            "cleanup_temp_files": self._parse_bool_env("CLEANUP_TEMP_FILES", "true"),
+            "debug_s3_urls": self._parse_bool_env("DEBUG_S3_URLS", "false"),
+            "log_gpu_info": self._parse_bool_env("LOG_GPU_INFO", "true"),
+            # Performance flags
+            "enable_torch_compile": self._parse_bool_env(
+                "ENABLE_TORCH_COMPILE", "false"
+            ),
+            "torch_compile_mode": _getenv("TORCH_COMPILE_MODE", "reduce-overhead"),
+            "torch_compile_backend": _getenv("TORCH_COMPILE_BACKEND", "inductor"),
+            "torch_compile_fullgraph": self._parse_bool_env(
+                "TORCH_COMPILE_FULLGRAPH", "false"
+            ),
+            "torch_compile_dynamic": self._parse_bool_env(
+                "TORCH_COMPILE_DYNAMIC", "false"
+            ),
+            "enable_tf32": self._parse_bool_env("ENABLE_TF32", "true"),
+            "enable_cudnn_benchmark": self._parse_bool_env(
+                "ENABLE_CUDNN_BENCHMARK", "true"
+            ),
+            "matmul_precision": _getenv("MATMUL_PRECISION", "high"),
+            # Additional CLI args for ComfyUI (space-separated)
+            "comfy_extra_args": _getenv("COMFY_EXTRA_ARGS", ""),
+            # Legacy serverless optimizations (kept for backward compatibility)
+            "disable_smart_memory": self._parse_bool_env(
+                "DISABLE_SMART_MEMORY", "false"
+            ),
+            "force_fp16": self._parse_bool_env("FORCE_FP16", "false"),
+            "cold_start_optimization": self._parse_bool_env(
+                "COLD_START_OPTIMIZATION", "true"
+            ),
+            "preload_models": self._parse_bool_env("PRELOAD_MODELS", "false"),
+            "gpu_memory_fraction": self._parse_float_env("GPU_MEMORY_FRACTION", "0.9"),
+        }
+
+    def _build_s3_config(self) -> Dict[str, Any]:
+        """Build the S3 configuration"""
+        return {
+            "bucket": _getenv("S3_BUCKET"),
+            "access_key": _getenv("S3_ACCESS_KEY"),
+            "secret_key": _getenv("S3_SECRET_KEY"),
+            "endpoint_url": _getenv("S3_ENDPOINT_URL"),
+            "region": _getenv("S3_REGION", "auto"),
+            "public_url": _getenv("S3_PUBLIC_URL"),
+            "signed_url_expiry": int(_getenv("S3_SIGNED_URL_EXPIRY", "3600")),
+            "cache_control": _getenv("S3_CACHE_CONTROL", "public, max-age=31536000"),
+            "signature_version": _getenv("S3_SIGNATURE_VERSION", "s3v4"),
+            "addressing_style": _getenv("S3_ADDRESSING_STYLE", "path"),
+        }
+
+    def _build_volume_config(self) -> Dict[str, Any]:
+        """Build the volume configuration"""
+        return {
+            "runpod_volume_path": _path_env("RUNPOD_VOLUME_PATH", "/runpod-volume"),
+            "runpod_output_dir": _getenv("RUNPOD_OUTPUT_DIR"),
+            "network_volume_timeout": self._parse_int_env(
+                "NETWORK_VOLUME_TIMEOUT", "15"
+            ),
+            "volume_models_dir": _getenv("VOLUME_MODELS_DIR"),
+        }
+
+    def _build_workspace_config(self) -> Dict[str, Any]:
+        """Build the workspace configuration"""
+        return {
+            "workspace_path": _WORKSPACE_PATH,
+            "comfyui_path": _COMFYUI_PATH,
+            "comfyui_models_path": _COMFYUI_MODELS_PATH,
+            "comfyui_output_path": _COMFYUI_OUTPUT_PATH,
+            "comfyui_logs_path": _COMFYUI_LOGS_PATH,
+            # Pre-rendered string forms for subprocess cwd and path slicing
+            "comfyui_path_str": _COMFYUI_PATH_STR,
+            "comfyui_output_path_str": _COMFYUI_OUTPUT_PATH_STR,
+        }
+
+    def _build_workflow_config(self) -> Mapping[str, Any]:
+        """Build the workflow configuration"""
+        return MappingProxyType(
+            {
+                "max_wait_time": self.MAX_WAIT_TIME,
+                "poll_interval": self.POLL_INTERVAL,
+                "default_workflow_duration": self.DEFAULT_WORKFLOW_DURATION,
+                "enable_startup_warmup": self._parse_bool_env(
+                    "ENABLE_STARTUP_WARMUP", "true"
+                ),
+            }
+        )
+
     def get(self, key: str, default: Any = None) -> Any:
         """
         Retrieve a configuration value by key.
@@ -171,23 +271,24 @@ class Config:
         Returns:
             Any: The value associated with the key, or the default if the key is not present.
         """
+        self._ensure_core_config()
         return self._config.get(key, default)
 
     def get_s3_config(self) -> Dict[str, Any]:
         """Get S3 configuration"""
-        return self._config["s3"]
+        return self._get_section("s3")
 
     def get_volume_config(self) -> Dict[str, Any]:
         """Get volume configuration"""
-        return self._config["volume"]
+        return self._get_section("volume")
 
     def get_workspace_config(self) -> Dict[str, Any]:
         """Get workspace configuration"""
-        return self._config["workspace"]
+        return self._get_section("workspace")
 
-    def get_workflow_config(self) -> Dict[str, Any]:
-        """Get workflow configuration"""
-        return self._config["workflow"]
+    def get_workflow_config(self) -> Mapping[str, Any]:
+        """Get workflow configuration (read-only)"""
+        return self._get_section("workflow")
 
     def is_s3_configured(self) -> bool:
         """Check if S3 is properly configured"""
@@ -197,18 +298,22 @@ class Config:
         )
 
     def get_comfyui_base_url(self) -> str:
-        """Get ComfyUI base URL"""
-        return f"http://{self._config['comfy_host']}:{self._config['comfy_port']}"
+        """Get ComfyUI base URL (host and port are fixed once loaded)"""
+        if self._comfyui_base_url is None:
+            self._ensure_core_config()
+            self._comfyui_base_url = (
+                f"http://{self._config['comfy_host']}:{self._config['comfy_port']}"
+            )
+        return self._comfyui_base_url
 
-    def get_supported_extensions(self) -> Dict[str, list]:
-        """Get supported file extensions"""
-        return {
-            "image": ["*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif"],
-            "video": ["*.mp4", "*.webm", "*.mov", "*.avi"],
-        }
+    def get_supported_extensions(self) -> Mapping[str, Tuple[str, ...]]:
+        """Get supported file extensions (read-only, shared across calls)"""
+        return _SUPPORTED_EXTENSIONS
 
 
 # Global configuration instance
 # Note: Singleton pattern is intentional for serverless functions.
-# Configuration is loaded once at container startup and reused across invocations.
+# Configuration sections are loaded on first access and reused across invocations.
+# Import this instance rather than constructing Config() again; a new Config
+# starts with no sections loaded.
 config = Config()
@@ -2,25 +2,115 @@
 Logging configuration for RunPod ComfyUI Serverless Handler
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
 from pathlib import Path
 from typing import Optional
 
+# Library log levels (LOG_LEVEL_<LIB>), resolved once at import
+_LIB_LEVELS = {
+    lib: getattr(
+        logging,
+        os.getenv(f"LOG_LEVEL_{lib.upper()}", "WARNING").upper(),
+        logging.WARNING,
+    )
+    for lib in ("urllib3", "requests", "boto3", "botocore")
+}
+
+
+def _env_int(key: str, default: int) -> int:
+    """Read a non-negative integer env var, falling back to default"""
+    try:
+        return max(0, int(os.getenv(key, default)))
+    except ValueError:
+        return default
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that batches writes in a 64 KiB buffer
+
+    Records are flushed every flush_interval seconds by a single daemon
+    thread, immediately for ERROR and above, and on close. Buffered records
+    below ERROR (up to flush_interval seconds' worth) are lost if the process
+    is killed before a flush. The file size is tracked in memory, so the
+    rollover check needs no seek/tell or stat per record.
+    """
+
+    def __init__(
+        self,
+        filename,
+        *args,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 30.0,
+        **kwargs,
+    ):
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._flush_stop = threading.Event()
+        self._bytes_written = 0
+        super().__init__(filename, *args, **kwargs)
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="log-file-flush", daemon=True
+        )
+        self._flush_thread.start()
+
+    def _open(self):
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=self._buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        self._bytes_written = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.encoding or "utf-8", self.errors or "strict"))
+            if self.maxBytes > 0 and self._bytes_written + size >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._bytes_written += size
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _flush_loop(self) -> None:
+        while not self._flush_stop.wait(self._flush_interval):
+            self.flush()
+
+    def close(self):
+        self._flush_stop.set()
+        if self._flush_thread is not threading.current_thread():
+            self._flush_thread.join()
+        super().close()
+
 
 class ComfyUILogger:
     """Centralized logging for ComfyUI Serverless Handler"""
 
     def __init__(self):
         self.logger = logging.getLogger("comfyui-serverless")
+        self._listener: Optional[logging.handlers.QueueListener] = None
         self._setup_logging()
 
     def _setup_logging(self):
         """Setup logging configuration"""
         # Clear existing handlers
         self.logger.handlers.clear()
+        self._stop_listener()
 
         # Set log level
         log_level = getattr(
@@ -47,12 +137,25 @@ class ComfyUILogger:
                 log_path.parent.mkdir(parents=True, exist_ok=True)
 
                 # Use rotating file handler to prevent log files from growing too large
-                file_handler = logging.handlers.RotatingFileHandler(
-                    log_file, maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
+                file_handler = BufferedRotatingFileHandler(
+                    log_file,
+                    maxBytes=_env_int("LOG_FILE_MAX_BYTES", 10 * 1024 * 1024),  # 10MB
+                    backupCount=_env_int("LOG_FILE_BACKUP_COUNT", 5),
                 )
                 file_handler.setFormatter(formatter)
                 file_handler.setLevel(log_level)
-                self.logger.addHandler(file_handler)
+
+                # Callers only enqueue; a background listener does the file
+                # write and the rollover check (seek/tell) off the hot path
+                log_queue = queue.SimpleQueue()
+                queue_handler = logging.handlers.QueueHandler(log_queue)
+                queue_handler.setLevel(log_level)
+                self.logger.addHandler(queue_handler)
+                self._listener = logging.handlers.QueueListener(
+                    log_queue, file_handler, respect_handler_level=True
+                )
+                self._listener.start()
+                atexit.register(self._stop_listener)
             except Exception as e:
                 # Fallback to console logging if file logging fails
                 print(f"Warning: Could not setup file logging: {e}")
@@ -61,23 +164,16 @@ class ComfyUILogger:
         self.logger.setLevel(log_level)
 
         # Prevent duplicate messages from libraries (configurable via env vars)
-        urllib3_level = getattr(
-            logging, os.getenv("LOG_LEVEL_URLLIB3", "WARNING").upper(), logging.WARNING
-        )
-        requests_level = getattr(
-            logging, os.getenv("LOG_LEVEL_REQUESTS", "WARNING").upper(), logging.WARNING
-        )
-        boto3_level = getattr(
-            logging, os.getenv("LOG_LEVEL_BOTO3", "WARNING").upper(), logging.WARNING
-        )
-        botocore_level = getattr(
-            logging, os.getenv("LOG_LEVEL_BOTOCORE", "WARNING").upper(), logging.WARNING
-        )
+        for lib, level in _LIB_LEVELS.items():
+            logging.getLogger(lib).setLevel(level)
 
-        logging.getLogger("urllib3").setLevel(urllib3_level)
-        logging.getLogger("requests").setLevel(requests_level)
-        logging.getLogger("boto3").setLevel(boto3_level)
-        logging.getLogger("botocore").setLevel(botocore_level)
+    def _stop_listener(self) -> None:
+        """Drain queued file records and stop the background listener"""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
 
     def get_logger(self, name: str) -> logging.Logger:
         """Get a logger with the specified name"""
@@ -107,6 +203,13 @@ class ComfyUILogger:
 # Global logger instance
 logger = ComfyUILogger()
 
+# Module-level shortcuts bound straight to the stdlib logger (no wrapper frame)
+debug = logger.logger.debug
+info = logger.logger.info
+warning = logger.logger.warning
+error = logger.logger.error
+critical = logger.logger.critical
+
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for the specified module"""
@@ -2,27 +2,113 @@
 S3 storage handler for RunPod ComfyUI Serverless
 """
 
-import datetime
+import asyncio
+import errno
 import mimetypes
+import os
+import secrets
 import shutil
+import threading
+import time
 import traceback
-import uuid
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional
 from urllib.parse import urlparse, urlunparse
 
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
-from botocore.config import Config
-
 from .config import config
 
+# MIME types for all ComfyUI output formats; other suffixes are added on first use
+_EXT_TO_MIME: Dict[str, str] = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".mp4": "video/mp4",
+    ".avi": "video/x-msvideo",
+    ".mov": "video/quicktime",
+    ".webm": "video/webm",
+}
+
+
+@lru_cache(maxsize=256)
+def _sanitize_url(url: str) -> str:
+    """Strip presigned query params from a URL (each URL is logged repeatedly)"""
+    try:
+        parsed = urlparse(url)
+
+        if parsed.query and "X-Amz-Signature" in parsed.query:
+            sanitized = urlunparse(
+                (parsed.scheme, parsed.netloc, parsed.path, "", "", "")
+            )
+            return f"{sanitized} [presigned - query params redacted for security]"
+        else:
+            return url
+    except (ValueError, TypeError):
+        return url
+
+
+def _utc_timestamp(micros: bool = False) -> str:
+    """UTC timestamp as YYYYmmdd_HHMMSS[_ffffff] without datetime/strftime"""
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    tm = time.gmtime(sec)
+    stamp = (
+        f"{tm.tm_year:04d}{tm.tm_mon:02d}{tm.tm_mday:02d}_"
+        f"{tm.tm_hour:02d}{tm.tm_min:02d}{tm.tm_sec:02d}"
+    )
+    return f"{stamp}_{us:06d}" if micros else stamp
+
+
+# errnos meaning sendfile() isn't usable for this pair of files
+_SENDFILE_UNSUPPORTED = frozenset(
+    {errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV}
+)
+
+
+def _fast_copy(src: Path, dst: Path) -> int:
+    """Copy src to dst in-kernel via sendfile (falling back to a buffered copy)
+    and return the copied size"""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        if size > 0:
+            # Reserve all extents up front; not every filesystem supports it
+            try:
+                os.posix_fallocate(dst_fd, 0, size)
+            except OSError:
+                pass
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError as e:
+            if e.errno not in _SENDFILE_UNSUPPORTED:
+                raise
+            # Filesystem (e.g. some network mounts) can't sendfile; copy the rest
+            # through userspace buffers
+            fsrc.seek(offset)
+            fdst.seek(offset)
+            shutil.copyfileobj(fsrc, fdst)
+            offset = fdst.tell()
+        if offset < size:
+            # Source shrank mid-copy; drop the unused preallocated tail
+            os.ftruncate(dst_fd, offset)
+    return offset
+
 
 class S3Handler:
     """Handle S3 storage operations"""
 
     def __init__(self):
         self._s3_client = None
+        self._transfer_config = None
+        self._s3_client_lock = threading.Lock()
+        self._s3_config: Optional[Dict[str, Any]] = None
+        self._public_url_prefix: Optional[str] = None
         self._logger = None
         self._debug_warning_logged = False
 
@@ -35,10 +121,32 @@ class S3Handler:
             self._logger = get_logger("s3_handler")
         return self._logger
 
+    def _get_s3_config(self) -> Dict[str, Any]:
+        """Snapshot S3 config and public URL prefix on first use"""
+        if self._s3_config is None:
+            s3_config = config.get_s3_config()
+            public_url = s3_config["public_url"]
+            self._public_url_prefix = public_url.rstrip("/") if public_url else None
+            self._s3_config = s3_config
+        return self._s3_config
+
     def _get_s3_client(self):
         """Create and return S3 client"""
-        if self._s3_client is None:
-            s3_config = config.get_s3_config()
+        if self._s3_client is not None:
+            return self._s3_client
+
+        # Uploads run in worker threads; build the client only once
+        with self._s3_client_lock:
+            if self._s3_client is not None:
+                return self._s3_client
+
+            # boto3/botocore are imported here, not at module load, so
+            # volume-only deployments never pay their import cost
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config
+
+            s3_config = self._get_s3_config()
 
             client_kwargs = {
                 "aws_access_key_id": s3_config["access_key"],
@@ -55,32 +163,28 @@ class S3Handler:
             if s3_config["region"]:
                 client_kwargs["region_name"] = s3_config["region"]
 
+            # Multipart uploads with concurrent parts for large (video) outputs
+            self._transfer_config = TransferConfig(
+                multipart_threshold=8 * 1024 * 1024,
+                multipart_chunksize=8 * 1024 * 1024,
+                max_concurrency=8,
+                use_threads=True,
+            )
             self._s3_client = boto3.client("s3", **client_kwargs)
 
         return self._s3_client
 
     def _get_content_type(self, file_path: Path) -> str:
         """Determine MIME type based on file extension"""
-        if not mimetypes.inited:
-            mimetypes.init()
-
-        mime_type, _ = mimetypes.guess_type(str(file_path))
+        suffix = file_path.suffix.lower()
+        mime_type = _EXT_TO_MIME.get(suffix)
 
         if mime_type is None:
-            fallback_types = {
-                ".png": "image/png",
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".webp": "image/webp",
-                ".gif": "image/gif",
-                ".mp4": "video/mp4",
-                ".avi": "video/x-msvideo",
-                ".mov": "video/quicktime",
-                ".webm": "video/webm",
-            }
-            mime_type = fallback_types.get(
-                file_path.suffix.lower(), "application/octet-stream"
-            )
+            # Unknown suffix: consult the system types DB once, then remember it
+            if not mimetypes.inited:
+                mimetypes.init()
+            mime_type = mimetypes.types_map.get(suffix, "application/octet-stream")
+            _EXT_TO_MIME[suffix] = mime_type
 
         return mime_type
 
@@ -96,31 +200,20 @@ class S3Handler:
                 self._debug_warning_logged = True
             return url
 
-        try:
-            parsed = urlparse(url)
-
-            if parsed.query and "X-Amz-Signature" in parsed.query:
-                sanitized = urlunparse(
-                    (parsed.scheme, parsed.netloc, parsed.path, "", "", "")
-                )
-                return f"{sanitized} [presigned - query params redacted for security]"
-            else:
-                return url
-        except (ValueError, TypeError):
-            return url
+        return _sanitize_url(url)
 
     def upload_file(self, file_path: Path, job_id: str) -> Dict[str, Any]:
         """Upload file to S3"""
+        from botocore.exceptions import ClientError, NoCredentialsError
+
         self.logger.info(f"Uploading to S3: {file_path.name}")
 
         try:
-            s3_config = config.get_s3_config()
+            s3_config = self._get_s3_config()
             s3_client = self._get_s3_client()
 
             # Generate S3 key with job_id prefix and timestamp
-            timestamp = datetime.datetime.now(datetime.timezone.utc).strftime(
-                "%Y%m%d_%H%M%S"
-            )
+            timestamp = _utc_timestamp()
             s3_key = f"{job_id}/{timestamp}_{file_path.name}"
 
             # Determine content type
@@ -131,20 +224,20 @@ class S3Handler:
             self.logger.debug(
                 f"Uploading to bucket: {s3_config['bucket']}, key: {s3_key}"
             )
-            with open(file_path, "rb") as f:
-                s3_client.upload_fileobj(
-                    f,
-                    s3_config["bucket"],
-                    s3_key,
-                    ExtraArgs={
-                        "ContentType": content_type,
-                        "CacheControl": s3_config["cache_control"],
-                    },
-                )
+            s3_client.upload_file(
+                str(file_path),
+                s3_config["bucket"],
+                s3_key,
+                ExtraArgs={
+                    "ContentType": content_type,
+                    "CacheControl": s3_config["cache_control"],
+                },
+                Config=self._transfer_config,
+            )
 
             # Generate URL
-            if s3_config["public_url"]:
-                url = f"{s3_config['public_url'].rstrip('/')}/{s3_key}"
+            if self._public_url_prefix:
+                url = f"{self._public_url_prefix}/{s3_key}"
             else:
                 url = s3_client.generate_presigned_url(
                     "get_object",
@@ -175,6 +268,10 @@ class S3Handler:
             self.logger.debug(f"Traceback: {traceback.format_exc()}")
             return {"success": False, "url": None, "error": error_msg}
 
+    async def upload_file_async(self, file_path: Path, job_id: str) -> Dict[str, Any]:
+        """Upload file to S3 in a worker thread so uploads can run concurrently"""
+        return await asyncio.to_thread(self.upload_file, file_path, job_id)
+
     def copy_to_volume(self, file_path: Path) -> Dict[str, Any]:
         """Copy file to volume output directory"""
         self.logger.info(f"Copying file to Volume Output: {file_path}")
@@ -186,20 +283,17 @@ class S3Handler:
             )
             volume_output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Unique filename with timestamp and UUID for better collision resistance
-            now = datetime.datetime.now(datetime.timezone.utc)
-            timestamp_str = now.strftime("%Y%m%d_%H%M%S_%f")
-            unique_id = str(uuid.uuid4())[:8]
+            # Unique filename with timestamp and random suffix for better collision resistance
+            timestamp_str = _utc_timestamp(micros=True)
+            unique_id = secrets.token_hex(4)
             dest_filename = f"comfyui-{timestamp_str}-{unique_id}-{file_path.name}"
             dest_path = volume_output_dir / dest_filename
 
             # Copy file
-            shutil.copy2(file_path, dest_path)
+            copied_bytes = _fast_copy(file_path, dest_path)
 
             self.logger.info(f"File successfully copied to: {dest_path}")
-            self.logger.debug(
-                f"File size: {dest_path.stat().st_size / (1024*1024):.2f} MB"
-            )
+            self.logger.debug(f"File size: {copied_bytes / (1024*1024):.2f} MB")
 
             return {"success": True, "path": str(dest_path), "error": None}
 
@@ -3,154 +3,359 @@ Workflow processing utilities for ComfyUI
 """
 
 import copy
+import logging
 import random
-import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from .config import config
 
+_logger: Optional[logging.Logger] = None
 
-class WorkflowProcessor:
-    """Handle workflow processing and seed randomization"""
+_JSON_SCALARS = (str, int, float, bool, type(None))
+_JSON_SCALAR_TYPES = frozenset(_JSON_SCALARS)
 
-    def randomize_seeds(self, workflow: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Randomize all seed values in the workflow.
+# Seeds are drawn from one wide getrandbits() call and handed out from a pool
+_SEED_BITS = 31
+_SEED_MASK = (1 << _SEED_BITS) - 1
+_SEED_BATCH = 16
+_seed_pool: List[int] = []
 
-        This function walks through all nodes in the workflow and replaces any 'seed'
-        parameters with random values (0 to 2^31-1). This ensures that each workflow
-        execution produces different results, even if the same workflow is sent multiple times.
 
-        Args:
-            workflow: ComfyUI workflow dictionary
+def _get_logger() -> logging.Logger:
+    """Lazy initialization of logger to avoid circular imports"""
+    global _logger
+    if _logger is None:
+        from .logger import get_logger
 
-        Returns:
-            dict: Modified workflow with randomized seeds (deep copy)
-        """
-        # Check if seed randomization is disabled via env var
-        if not config.get("randomize_seeds", True):
-            print("🎲 Seed randomization disabled via RANDOMIZE_SEEDS=false")
-            return workflow
+        _logger = get_logger("workflow_processor")
+    return _logger
 
-        # Create deep copy to avoid in-place modification
-        workflow = copy.deepcopy(workflow)
 
-        # Walk through all nodes in the workflow
-        randomized_count = [0]  # Use a list to allow mutation in recursive calls
-        for node_id, node_data in workflow.items():
-            if isinstance(node_data, dict) and "inputs" in node_data:
-                inputs = node_data["inputs"]
-                self._randomize_seeds_in_obj(
-                    inputs,
-                    node_id=node_id,
-                    path="inputs",
-                    randomized_count=randomized_count,
-                )
-
-        if randomized_count[0] > 0:
-            print(f"✅ Randomized {randomized_count[0]} seed(s) in workflow")
+def _refill_seed_pool() -> None:
+    """Split a single getrandbits(31 * batch) call into a batch of 31-bit seeds"""
+    bits = random.getrandbits(_SEED_BITS * _SEED_BATCH)
+    _seed_pool.extend(
+        (bits >> (_SEED_BITS * i)) & _SEED_MASK for i in range(_SEED_BATCH)
+    )
+
+
+def reset_seed_pool() -> None:
+    """Discard pre-drawn seeds so the next one reflects the current random state
+
+    Call after random.seed() when the following seeds must be reproducible.
+    """
+    _seed_pool.clear()
+
+
+def _naive_deepcopy(obj: Any) -> Any:
+    """Deep copy for JSON-shaped data (dicts, lists and immutable scalars)
+
+    Skips copy.deepcopy's memo dict and __deepcopy__ probing; anything that is
+    not plain JSON falls back to copy.deepcopy.
+    """
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {k: _naive_deepcopy(v) for k, v in obj.items()}
+    if obj_type is list:
+        return [_naive_deepcopy(v) for v in obj]
+    if obj_type in _JSON_SCALARS:
+        return obj
+    return copy.deepcopy(obj)
+
+
+def _format_trail(trail: Tuple[Union[str, int], ...]) -> str:
+    """Render a key/index trail as a dotted path, e.g. inputs.x.l[0].seed"""
+    parts = []
+    for token in trail:
+        if type(token) is int:
+            parts.append(f"[{token}]")
+        elif parts:
+            parts.append(f".{token}")
         else:
-            print("ℹ️ No seeds found in workflow to randomize")
+            parts.append(token)
+    return "".join(parts)
+
 
+class WorkflowView:
+    """Node index over a workflow, built in a single pass and shared by queries"""
+
+    __slots__ = ("_workflow", "_by_class", "_ids")
+
+    def __init__(self, workflow: Dict[str, Any]):
+        by_class: Dict[Optional[str], List[str]] = {}
+        for node_id, node_data in workflow.items():
+            class_type = (
+                node_data.get("class_type") if type(node_data) is dict else None
+            )
+            if type(class_type) is not str:
+                class_type = None
+            by_class.setdefault(class_type, []).append(node_id)
+        self._workflow = workflow
+        self._by_class = by_class
+        self._ids = tuple(workflow)
+
+    @property
+    def workflow(self) -> Dict[str, Any]:
+        return self._workflow
+
+    @property
+    def node_ids(self) -> Tuple[str, ...]:
+        return self._ids
+
+    def nodes_of_class(self, class_type: str) -> List[str]:
+        """Node ids with the given class_type, in workflow order"""
+        return list(self._by_class.get(class_type, ()))
+
+
+def randomize_seeds(
+    workflow: Dict[str, Any], *, in_place: bool = False
+) -> Dict[str, Any]:
+    """
+    Randomize all seed values in the workflow.
+
+    This function walks through all nodes in the workflow and replaces any integer
+    'seed' parameters with random values (0 to 2^31-1); ComfyUI seeds are always
+    ints, so float/bool values are left untouched. This ensures that each workflow
+    execution produces different results, even if the same workflow is sent multiple times.
+
+    Args:
+        workflow: ComfyUI workflow dictionary
+        in_place: Mutate the given workflow instead of copying it. Only pass True
+            when the caller owns the dict (e.g. freshly parsed request JSON)
+
+    Returns:
+        dict: Modified workflow with randomized seeds (deep copy unless in_place)
+    """
+    # Check if seed randomization is disabled via env var
+    if not config.get("randomize_seeds", True):
+        _get_logger().info("🎲 Seed randomization disabled via RANDOMIZE_SEEDS=false")
         return workflow
 
-    def _generate_random_seed(self):
-        """
-        Generate a random seed value using getrandbits for better performance.
-
-        Returns:
-            int: Random seed in range 0 to 2^31-1 (2,147,483,647)
-
-        Note:
-            Uses 31 bits (not 32) to ensure compatibility with signed 32-bit integers
-            used by ComfyUI nodes. This avoids potential overflow issues with nodes
-            that expect non-negative integers within the signed int32 range.
-        """
-        # Use getrandbits(31) for signed 32-bit int compatibility and performance
-        return random.getrandbits(31)
-
-    def _randomize_seeds_in_obj(
-        self, obj, node_id=None, path="", randomized_count=None
-    ):
-        """Recursively traverse and randomize all seed values in nested structures"""
-        if randomized_count is None:
-            randomized_count = [0]
-
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                current_path = f"{path}.{key}" if path else key
-                if key == "seed" and isinstance(value, (int, float)):
-                    # Found a seed parameter - randomize it
-                    old_seed = value
-                    new_seed = self._generate_random_seed()
-                    obj[key] = new_seed
-                    randomized_count[0] += 1
+    # Per-seed lines go through the logger with lazy %-args; when they would be
+    # filtered anyway, skip path tracking and formatting altogether
+    verbose = config.get("log_seed_randomization", False) and (
+        _get_logger().isEnabledFor(logging.INFO)
+    )
+
+    # Copy the workflow and rewrite seeds in the same pass (unless in_place)
+    randomized_count = [0]  # Mutable cell so _copy_and_randomize can add to it
+    result = workflow if in_place else {}
+    for node_id, node_data in workflow.items():
+        if type(node_data) is not dict or "inputs" not in node_data:
+            if not in_place:
+                result[node_id] = _naive_deepcopy(node_data)
+            continue
+
+        inputs = _copy_and_randomize(
+            node_data["inputs"],
+            node_id=node_id,
+            trail=("inputs",),
+            randomized_count=randomized_count,
+            verbose=verbose,
+            in_place=in_place,
+        )
+
+        if not in_place:
+            result[node_id] = {
+                key: inputs if key == "inputs" else _naive_deepcopy(value)
+                for key, value in node_data.items()
+            }
+
+    if randomized_count[0] > 0:
+        _get_logger().info("✅ Randomized %s seed(s) in workflow", randomized_count[0])
+    else:
+        _get_logger().info("ℹ️ No seeds found in workflow to randomize")
+
+    return result
 
+
+def _generate_random_seed() -> int:
+    """
+    Generate a random seed value from a batched getrandbits pool.
+
+    Returns:
+        int: Random seed in range 0 to 2^31-1 (2,147,483,647)
+
+    Note:
+        Uses 31 bits (not 32) to ensure compatibility with signed 32-bit integers
+        used by ComfyUI nodes. This avoids potential overflow issues with nodes
+        that expect non-negative integers within the signed int32 range.
+
+        Seeds are drawn from `random` in batches of 16, so calling random.seed()
+        mid-batch only takes effect once the pool runs dry; call
+        reset_seed_pool() after reseeding for reproducible seeds.
+    """
+    # 31-bit slices of one getrandbits call, refilled every _SEED_BATCH seeds
+    try:
+        return _seed_pool.pop()
+    except IndexError:
+        _refill_seed_pool()
+        return _seed_pool.pop()
+
+
+def _copy_and_randomize(
+    obj: Any,
+    node_id: Optional[str] = None,
+    trail: Tuple[Union[str, int], ...] = (),
+    randomized_count: Optional[List[int]] = None,
+    verbose: bool = False,
+    in_place: bool = False,
+) -> Any:
+    """Copy nested structures, randomizing all seed values on the way
+
+    With in_place=True nothing is copied: seeds are rewritten in obj itself,
+    which is returned.
+
+    Uses an explicit stack of (source, copy, trail) containers instead of
+    recursion, so deep inputs cost no extra Python frames. The trail of
+    ancestor keys/indices is only tracked when verbose is set, and is
+    joined into a dotted path only for seeds that actually get logged.
+    """
+    if randomized_count is None:
+        randomized_count = [0]
+
+    if in_place:
+        if type(obj) is not dict and type(obj) is not list:
+            return obj
+        result = obj
+    elif type(obj) is dict:
+        result = {}
+    elif type(obj) is list:
+        result = [None] * len(obj)
+    else:
+        return _naive_deepcopy(obj)
+
+    # Bind hot globals/builtins to locals once for the loop below
+    dict_, list_, int_, str_ = dict, list, int, str
+    scalar_types = _JSON_SCALAR_TYPES
+    next_seed = _generate_random_seed
+    copy_leaf = _naive_deepcopy
+
+    stack = [(obj, result, trail if verbose else None)]
+    push, pop = stack.append, stack.pop
+    while stack:
+        src, dst, src_trail = pop()
+        is_dict = type(src) is dict_
+        for key, value in src.items() if is_dict else enumerate(src):
+            value_type = type(value)
+            if is_dict and key == "seed" and value_type is int_:
+                # Found a seed parameter - randomize it
+                old_seed = value
+                new_seed = next_seed()
+                dst[key] = new_seed
+                randomized_count[0] += 1
+
+                if verbose:
+                    current_path = _format_trail(src_trail + (key,))
                     if node_id is not None:
-                        print(
-                            f"🎲 Node {node_id}: Randomized seed at {current_path}: {old_seed} → {new_seed}"
+                        _get_logger().info(
+                            "🎲 Node %s: Randomized seed at %s: %s → %s",
+                            node_id,
+                            current_path,
+                            old_seed,
+                            new_seed,
                         )
                     else:
-                        print(
-                            f"🎲 Randomized seed at {current_path}: {old_seed} → {new_seed}"
+                        _get_logger().info(
+                            "🎲 Randomized seed at %s: %s → %s",
+                            current_path,
+                            old_seed,
+                            new_seed,
                         )
+            elif value_type in scalar_types:
+                # Prompts, numbers, names: nothing to descend into
+                if not in_place:
+                    dst[key] = value
+            elif (
+                value_type is list_
+                and len(value) == 2
+                and type(value[0]) is str_
+                and type(value[1]) is int_
+            ):
+                # Node link ["12", 0]: cannot hold a seed, so don't traverse it
+                if not in_place:
+                    dst[key] = [value[0], value[1]]
+            elif value_type is dict_ or value_type is list_:
+                if in_place:
+                    child = value
                 else:
-                    # Recursively process nested structures
-                    self._randomize_seeds_in_obj(
-                        value,
-                        node_id=node_id,
-                        path=current_path,
-                        randomized_count=randomized_count,
+                    dst[key] = child = (
+                        {} if value_type is dict_ else [None] * len(value)
                     )
+                push((value, child, src_trail + (key,) if verbose else None))
+            elif not in_place:
+                dst[key] = copy_leaf(value)
 
-        elif isinstance(obj, list):
-            for idx, item in enumerate(obj):
-                current_path = f"{path}[{idx}]" if path else f"[{idx}]"
-                self._randomize_seeds_in_obj(
-                    item,
-                    node_id=node_id,
-                    path=current_path,
-                    randomized_count=randomized_count,
-                )
-
-    def extract_checkpoint_names(self, object_info: Dict[str, Any]) -> List[str]:
-        """Safely extract checkpoint names from ComfyUI object_info response"""
-        try:
-            # Navigate through the nested structure
-            checkpoint_loader = object_info.get("CheckpointLoaderSimple", {})
-            input_spec = checkpoint_loader.get("input", {})
-            required_spec = input_spec.get("required", {})
-            ckpt_name = required_spec.get("ckpt_name", [])
-
-            # Handle nested list format [[model_names], {}]
-            if isinstance(ckpt_name, list) and len(ckpt_name) > 0:
-                if isinstance(ckpt_name[0], list):
-                    # Nested format: extract first list
-                    return ckpt_name[0] if len(ckpt_name[0]) > 0 else []
-                else:
-                    # Simple list format
-                    return ckpt_name
+    return result
 
-            return []
-        except (AttributeError, TypeError, KeyError, IndexError) as e:
-            print(f"⚠️ Error extracting checkpoint names: {e}")
-            return []
 
-    def find_save_nodes(self, workflow: Dict[str, Any]) -> List[str]:
-        """Find all SaveImage nodes in the workflow"""
+def extract_checkpoint_names(object_info: Dict[str, Any]) -> List[str]:
+    """Safely extract checkpoint names from ComfyUI object_info response"""
+    try:
+        # Navigate through the nested structure (missing keys mean no checkpoints)
+        ckpt_name = object_info["CheckpointLoaderSimple"]["input"]["required"][
+            "ckpt_name"
+        ]
+
+        # Handle nested list format [[model_names], {}]
+        if type(ckpt_name) is list and ckpt_name:
+            choices = ckpt_name[0]
+            if type(choices) is list:
+                # Nested format: the first entry is the list of names
+                return choices
+            # Simple list format
+            return ckpt_name
+
+        return []
+    except KeyError:
+        return []
+    except (AttributeError, TypeError, IndexError) as e:
+        _get_logger().warning("⚠️ Error extracting checkpoint names: %s", e)
+        return []
+
+
+def find_save_nodes(workflow: Union[Dict[str, Any], WorkflowView]) -> List[str]:
+    """Find all SaveImage nodes in the workflow"""
+    if type(workflow) is WorkflowView:
+        save_nodes = workflow.nodes_of_class("SaveImage")
+    else:
         save_nodes = [
-            k for k, v in workflow.items() if v.get("class_type") == "SaveImage"
+            k
+            for k, v in workflow.items()
+            if type(v) is dict and v.get("class_type") == "SaveImage"
         ]
-        print(f"💾 SaveImage Nodes found: {len(save_nodes)}")
-        return save_nodes
+    _get_logger().info("💾 SaveImage Nodes found: %s", len(save_nodes))
+    return save_nodes
+
+
+def count_workflow_nodes(workflow: Union[Dict[str, Any], WorkflowView]) -> int:
+    """Count total nodes in workflow"""
+    if type(workflow) is WorkflowView:
+        return len(workflow.node_ids)
+    return len(workflow)
+
+
+def get_workflow_node_ids(workflow: Union[Dict[str, Any], WorkflowView]) -> List[str]:
+    """Get all node IDs in workflow"""
+    if type(workflow) is WorkflowView:
+        return list(workflow.node_ids)
+    return list(workflow.keys())
+
+
+class WorkflowProcessor:
+    """Handle workflow processing and seed randomization
+
+    Thin compatibility wrapper over the module-level functions; the methods are
+    staticmethods so calls through the instance don't bind self.
+    """
 
-    def count_workflow_nodes(self, workflow: Dict[str, Any]) -> int:
-        """Count total nodes in workflow"""
-        return len(workflow)
+    __slots__ = ()
 
-    def get_workflow_node_ids(self, workflow: Dict[str, Any]) -> List[str]:
-        """Get all node IDs in workflow"""
-        return list(workflow.keys())
+    randomize_seeds = staticmethod(randomize_seeds)
+    extract_checkpoint_names = staticmethod(extract_checkpoint_names)
+    find_save_nodes = staticmethod(find_save_nodes)
+    count_workflow_nodes = staticmethod(count_workflow_nodes)
+    get_workflow_node_ids = staticmethod(get_workflow_node_ids)
 
 
 # Global workflow processor instance